@@ -7,29 +7,38 @@ Patent-Centric Market Evaluation with Tavily Search Integration
 """
 
 from __future__ import annotations
-import os, json, re
-from typing import Any, Dict, List, Optional, TypedDict
+import os, json, re, time, pickle, hashlib, logging, threading
+from functools import lru_cache
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, TypedDict
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 
 from pydantic import BaseModel, Field, field_validator
 
-# LangChain / LangGraph
-from langchain_chroma import Chroma
-from langchain_ollama import OllamaEmbeddings
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.documents import Document
-from langchain_community.retrievers import BM25Retriever
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
-
-# Tavily Search
-from tavily import TavilyClient
+from agents.patent_api import (
+    MAX_429_RETRIES,
+    RETRY_STATUSES,
+    backoff_seconds,
+    http_slot,
+    json_loads,
+    json_write,
+)
+
+# LangChain / LangGraph / Tavily는 무거워서(콜드 스타트 1~2초) 실제 사용하는 함수 안에서 import
+if TYPE_CHECKING:
+    from langchain_chroma import Chroma
+    from langchain_openai import ChatOpenAI
+    from langchain_core.documents import Document
+    from tavily import TavilyClient
 
 load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 
+logger = logging.getLogger(__name__)
+_RULE = "=" * 80  # 단계 구분선 (DEBUG 레벨에서만 출력)
+
 
 # ===== State Definition =====
 class MarketState(TypedDict, total=False):
@@ -42,6 +51,7 @@ class MarketState(TypedDict, total=False):
     keyterms: List[str]
     retrieved_docs: List[Any]
     web_search_results: List[Dict[str, Any]]
+    prefetched_web_results: List[Dict[str, Any]]  # 키워드 추출과 동시에 미리 조회한 기술명 쿼리 결과
     
     # Scores
     market_size_score: float
@@ -94,8 +104,43 @@ class _MarketSchema(BaseModel):
 
 
 # ===== Helpers =====
+TAVILY_MARKET_MAX_RESULTS = 4  # 통합 쿼리 (기존 시장 규모 2 + CAGR 2)
+TAVILY_BASE_MAX_RESULTS = 2
+TAVILY_CACHE_TTL_SECONDS = 86400  # 1일 (시장 규모/CAGR 기사는 하루 단위로는 거의 변하지 않음)
+TAVILY_USE_DISK_CACHE = os.getenv("TAVILY_NO_CACHE", "").lower() not in ("1", "true", "yes")
+TAVILY_CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "tavily"
+TAVILY_HOST = "api.tavily.com"
+MIN_ABSTRACT_CHARS_FOR_LLM = 200  # 이보다 짧은 초록은 LLM 호출 없이 정규식 추출
+KEYTERM_CACHE_MAXSIZE = 512  # 키워드 추출 결과 메모리 캐시 최대 항목 수 (초과 시 가장 오래 안 쓴 항목 제거)
+_KEYTERM_CACHE: "OrderedDict[str, List[str]]" = OrderedDict()  # (title, abstract, max_terms) 해시 → 키워드
+_KEYTERM_CACHE_LOCK = threading.Lock()
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9\-]{3,}")
+BM25_INDEX_FORMAT = "bm25okapi-v1"  # rag/build_index.py 와 공유하는 pickle 포맷 식별자
+BM25_TOKEN_PATTERN = r"\w+"          # 인덱스 재구축 시 토큰 패턴 (pickle에 함께 저장)
+
+
+def _regex_keyterms(text: str, max_terms: int) -> List[str]:
+    """단순 정규식 기반 키워드 추출 (LLM 폴백)"""
+    tokens = _TOKEN_RE.findall((text or "").lower())
+    return [t for t, _ in Counter(tokens).most_common(max_terms)]
+
+
 def _extract_keyterms_from_abstract(llm: ChatOpenAI, title: str, abstract: str, max_terms: int = 8) -> List[str]:
-    """LLM으로 abstract에서 핵심 기술 키워드 추출"""
+    """LLM으로 abstract에서 핵심 기술 키워드 추출 (동일 입력은 캐시, 짧은 초록은 정규식)"""
+    if not abstract or len(abstract) < MIN_ABSTRACT_CHARS_FOR_LLM:
+        return _regex_keyterms(f"{title} {abstract or ''}", max_terms)
+
+    from langchain_core.prompts import ChatPromptTemplate
+
+    cache_key = hashlib.blake2b(
+        f"{title}|{abstract}|{max_terms}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+    with _KEYTERM_CACHE_LOCK:
+        cached = _KEYTERM_CACHE.get(cache_key)
+        if cached is not None:
+            _KEYTERM_CACHE.move_to_end(cache_key)
+            return list(cached)
+
     system = (
         "너는 특허 기술 분석 전문가다. "
         "제목과 초록에서 핵심 기술 키워드(대표어)만 추출한다. "
@@ -113,13 +158,17 @@ def _extract_keyterms_from_abstract(llm: ChatOpenAI, title: str, abstract: str,
 
     try:
         result: _KeytermsSchema = chain.invoke({"title": title, "abstract": abstract})
-        return [t.strip() for t in result.keyterms if t.strip()][:max_terms]
+        keyterms = [t.strip() for t in result.keyterms if t.strip()][:max_terms]
+        with _KEYTERM_CACHE_LOCK:
+            _KEYTERM_CACHE[cache_key] = keyterms
+            _KEYTERM_CACHE.move_to_end(cache_key)
+            if len(_KEYTERM_CACHE) > KEYTERM_CACHE_MAXSIZE:
+                _KEYTERM_CACHE.popitem(last=False)
+        return list(keyterms)
     except Exception as e:
-        print(f"  ⚠️ Keyterm extraction failed: {e}")
+        logger.warning("  ⚠️ Keyterm extraction failed: %s", e)
         # Fallback: 단순 추출
-        text = (abstract or "").lower()
-        tokens = re.findall(r"[a-z][a-z0-9\-]{3,}", text)
-        return sorted(set(tokens), key=tokens.count, reverse=True)[:max_terms]
+        return _regex_keyterms(abstract, max_terms)
 
 
 def _build_rag_query(tech_name: str, keyterms: List[str]) -> str:
@@ -135,21 +184,57 @@ def _build_rag_query(tech_name: str, keyterms: List[str]) -> str:
     return " ".join(unique)
 
 
-def _build_tavily_queries(tech_name: str, keyterms: List[str]) -> List[str]:
-    """Tavily 검색 쿼리 생성 (시장 규모, CAGR)"""
-    queries = []
-    
-    # 1. 기술 키워드 기반 시장 규모
+def _tavily_cache_path(query: str, max_results: int) -> Path:
+    key = hashlib.blake2b(f"{query}|{max_results}".encode("utf-8"), digest_size=16).hexdigest()
+    return TAVILY_CACHE_DIR / f"{key}.json"
+
+
+def _tavily_cache_load(query: str, max_results: int) -> Optional[List[Dict[str, Any]]]:
+    """Tavily 디스크 캐시 조회 (TTL 만료 시 None)"""
+    if not TAVILY_USE_DISK_CACHE:
+        return None
+    path = _tavily_cache_path(query, max_results)
+    try:
+        if time.time() - path.stat().st_mtime > TAVILY_CACHE_TTL_SECONDS:
+            return None
+        return json_loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _tavily_cache_store(query: str, max_results: int, results: List[Dict[str, Any]]) -> None:
+    """Tavily 디스크 캐시 저장 (실패해도 평가는 계속 진행)"""
+    if not TAVILY_USE_DISK_CACHE:
+        return
+    path = _tavily_cache_path(query, max_results)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        json_write(str(path), results)
+    except (OSError, TypeError) as e:
+        logger.warning("  ⚠️ Tavily cache write failed: %s", e)
+
+
+def _tavily_error_status(e: Exception) -> Optional[int]:
+    """Tavily 예외 → HTTP 상태 코드 (429는 UsageLimitExceededError, 그 외는 requests.HTTPError.response)"""
+    response = getattr(e, "response", None)
+    if response is not None:
+        return getattr(response, "status_code", None)
+    if type(e).__name__ == "UsageLimitExceededError":
+        return 429
+    return None
+
+
+def _build_tavily_market_query(tech_name: str, keyterms: List[str]) -> str:
+    """키워드가 필요한 Tavily 쿼리 (시장 규모 + CAGR 통합)"""
+    # 1. 기술 키워드 기반 시장 규모 및 CAGR 성장률 (한 번의 요청으로 조회)
     tech_terms = " ".join([tech_name] + keyterms[:3])
-    queries.append(f"{tech_terms} market size 2024 2025 billion USD")
-    
-    # 2. CAGR 및 성장률
-    queries.append(f"{tech_terms} CAGR growth rate forecast 2024-2028")
-    
-    # 3. 응용 분야 일반 쿼리
-    queries.append(f"{tech_name} application market forecast")
-    
-    return queries[:3]  # 최대 3개 쿼리
+    return f"{tech_terms} market size CAGR 2024 2025 2028 forecast billion USD"
+
+
+def _build_tavily_base_query(tech_name: str) -> str:
+    """기술명만 쓰는 Tavily 쿼리 (키워드 추출 전에 미리 실행 가능)"""
+    # 2. 응용 분야 일반 쿼리
+    return f"{tech_name} application market forecast"
 
 
 def _collect_sources(rag_docs: List[Document], tavily_results: List[Dict[str, Any]], max_items: int = 8) -> List[str]:
@@ -179,6 +264,134 @@ def _collect_sources(rag_docs: List[Document], tavily_results: List[Dict[str, An
     return sources or ["No sources available"]
 
 
+def _iter_chroma_documents(vs: Chroma, batch_size: int = 1000) -> Iterator[Document]:
+    """Chroma 컬렉션 문서를 batch_size 단위로 페이지 조회 (전체 코퍼스 한 번에 적재 X)"""
+    from langchain_core.documents import Document
+
+    offset = 0
+    while True:
+        batch = vs.get(limit=batch_size, offset=offset, include=["documents", "metadatas"])
+        docs = batch.get("documents") or []
+        if not docs:
+            return
+        metas = batch.get("metadatas") or [None] * len(docs)
+        for d, m in zip(docs, metas):
+            yield Document(page_content=d or "", metadata=m or {})
+        offset += len(docs)
+
+
+class _BM25Index:
+    """
+    rank_bm25.BM25Okapi + 원문/메타데이터 (LangChain BM25Retriever 대체)
+    - 쿼리마다 코퍼스 Document 래핑 X, top-k만 numpy argpartition으로 선택
+    """
+
+    def __init__(self, payload: Dict[str, Any], k: int = 4):
+        self.bm25 = payload["bm25"]
+        self.texts: List[str] = payload["texts"]
+        self.metadatas: List[Dict[str, Any]] = payload["metadatas"]
+        self.k = k
+        self._token_re = re.compile(payload["token_pattern"])
+
+    def invoke(self, query: str) -> List[Document]:
+        import numpy as np
+        from langchain_core.documents import Document
+
+        if self.bm25 is None or not self.texts:
+            return []
+        scores = np.asarray(self.bm25.get_scores(self._token_re.findall(query.lower())))
+        k = min(self.k, len(scores))
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]  # k개만 점수 내림차순 정렬
+        return [Document(page_content=self.texts[i], metadata=self.metadatas[i]) for i in top]
+
+
+def _build_bm25_payload(docs: Iterator[Document]) -> Dict[str, Any]:
+    """문서 → 사전 토큰화된 BM25Okapi pickle 페이로드"""
+    from rank_bm25 import BM25Okapi
+
+    token_re = re.compile(BM25_TOKEN_PATTERN)
+    texts: List[str] = []
+    metadatas: List[Dict[str, Any]] = []
+    for doc in docs:
+        texts.append(doc.page_content)
+        metadatas.append(doc.metadata)
+    tokenized = [token_re.findall(t.lower()) for t in texts]
+    return {
+        "format": BM25_INDEX_FORMAT,
+        "token_pattern": BM25_TOKEN_PATTERN,
+        "bm25": BM25Okapi(tokenized) if tokenized else None,
+        "texts": texts,
+        "metadatas": metadatas,
+    }
+
+
+def _load_or_build_bm25(vs: Chroma, chroma_dir: str, collection: str, k: int = 4) -> _BM25Index:
+    """
+    BM25 인덱스 로드 (pickle 캐시 우선)
+    Chroma DB(chroma.sqlite3)보다 최신 pickle이 있으면 전체 문서 로드/토큰화 생략
+    pickle은 rag/build_index.py가 인덱스 구축 시 함께 저장 (없을 때만 여기서 재구축)
+    """
+    bm25_path = Path(chroma_dir) / f"{collection}_bm25.pkl"
+    db_path = Path(chroma_dir) / "chroma.sqlite3"
+    db_mtime = db_path.stat().st_mtime if db_path.exists() else 0.0
+
+    try:
+        if bm25_path.stat().st_mtime >= db_mtime:
+            with open(bm25_path, "rb") as f:
+                payload = pickle.load(f)
+            if isinstance(payload, dict) and payload.get("format") == BM25_INDEX_FORMAT:
+                logger.info("  ✅ BM25 index loaded from cache: %s", bm25_path)
+                return _BM25Index(payload, k=k)
+            logger.warning("  ⚠️ BM25 cache has an old format, rebuilding")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("  ⚠️ BM25 cache load failed, rebuilding: %s", e)
+
+    payload = _build_bm25_payload(_iter_chroma_documents(vs))
+
+    try:
+        with open(bm25_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        logger.warning("  ⚠️ BM25 cache write failed: %s", e)
+    return _BM25Index(payload, k=k)
+
+
+# ===== Shared resources (에이전트 인스턴스 간 재사용) =====
+@lru_cache(maxsize=4)
+def _get_vectorstore(collection: str, chroma_dir: str, embed_model: str) -> Chroma:
+    from langchain_chroma import Chroma
+    from langchain_ollama import OllamaEmbeddings
+
+    return Chroma(
+        collection_name=collection,
+        persist_directory=chroma_dir,
+        embedding_function=OllamaEmbeddings(model=embed_model),
+    )
+
+
+@lru_cache(maxsize=4)
+def _get_bm25(collection: str, chroma_dir: str, embed_model: str) -> _BM25Index:
+    vs = _get_vectorstore(collection, chroma_dir, embed_model)
+    return _load_or_build_bm25(vs, chroma_dir, collection, k=4)
+
+
+@lru_cache(maxsize=4)
+def _get_llm(model: str, api_key: Optional[str]) -> ChatOpenAI:
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(model=model, temperature=0, openai_api_key=api_key)
+
+
+@lru_cache(maxsize=4)
+def _get_tavily(api_key: str) -> TavilyClient:
+    from tavily import TavilyClient
+
+    return TavilyClient(api_key=api_key)
+
+
 # ===== Agent =====
 class MarketSizeGrowthAgent:
     def __init__(
@@ -200,34 +413,27 @@ class MarketSizeGrowthAgent:
         api_key = os.getenv("OPENAI_API_KEY")
         tavily_key = os.getenv("TAVILY_API_KEY")
 
-        # VectorDB setup
-        self.embeddings = OllamaEmbeddings(model=self.embed_model)
-        self.vs = Chroma(
-            collection_name=self.collection,
-            persist_directory=self.chroma_dir,
-            embedding_function=self.embeddings
-        )
+        # VectorDB setup (모듈 단위 캐시 → 두 번째 인스턴스부터 재사용)
+        self.vs = _get_vectorstore(self.collection, self.chroma_dir, self.embed_model)
+        self.embeddings = self.vs.embeddings
         self.semantic = self.vs.as_retriever(search_kwargs={"k": 4})
 
-        # BM25 setup
-        all_docs = self.vs.get(include=["documents", "metadatas"])
-        bm25_docs = [
-            Document(page_content=d or "", metadata=m or {}) 
-            for d, m in zip(all_docs["documents"], all_docs["metadatas"])
-        ]
-        self.bm25 = BM25Retriever.from_documents(bm25_docs)
-        self.bm25.k = 4
+        # BM25 setup (디스크 캐시된 인덱스 재사용)
+        self.bm25 = _get_bm25(self.collection, self.chroma_dir, self.embed_model)
 
         # LLM
-        self.llm = ChatOpenAI(model=self.llm_model, temperature=0, openai_api_key=api_key)
+        self.llm = _get_llm(self.llm_model, api_key)
         
         # Tavily Client
-        self.tavily = TavilyClient(api_key=tavily_key) if tavily_key else None
+        self.tavily = _get_tavily(tavily_key) if tavily_key else None
         
         self.graph = self._build_graph()
 
     def _build_graph(self):
         """LangGraph 구성"""
+        from langgraph.graph import StateGraph, END
+        from langgraph.checkpoint.memory import MemorySaver
+
         g = StateGraph(MarketState)
         g.add_node("retrieve_rag", self._node_retrieve_rag)
         g.add_node("retrieve_web", self._node_retrieve_web)
@@ -243,44 +449,78 @@ class MarketSizeGrowthAgent:
     def _node_retrieve_rag(self, state: MarketState) -> MarketState:
         """RAG 검색 노드"""
         query = state["query"]
-        print(f"🔍 [RAG] Retrieving documents for: {query}")
+        logger.info("🔍 [RAG] Retrieving documents for: %s", query)
         
-        docs_semantic = self.semantic.invoke(query)
-        docs_bm25 = self.bm25.invoke(query)  # get_relevant_documents → invoke
+        # ✅ 임베딩 기반 검색(Ollama 대기)과 BM25(CPU) 동시 실행
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            f_semantic = ex.submit(self.semantic.invoke, query)
+            f_bm25 = ex.submit(self.bm25.invoke, query)
+            docs_semantic = f_semantic.result()
+            docs_bm25 = f_bm25.result()
         all_docs = (docs_semantic or []) + (docs_bm25 or [])
         
-        print(f"  ✅ Retrieved {len(all_docs)} RAG documents")
+        logger.info("  ✅ Retrieved %s RAG documents", len(all_docs))
         state["retrieved_docs"] = all_docs
         return state
 
     def _node_retrieve_web(self, state: MarketState) -> MarketState:
         """Tavily 웹 검색 노드"""
         if not self.tavily:
-            print("  ⚠️ Tavily API key not found, skipping web search")
+            logger.warning("  ⚠️ Tavily API key not found, skipping web search")
             state["web_search_results"] = []
             return state
         
         tech = state["tech_name"]
         keyterms = state["keyterms"]
         
-        # 시장 데이터 검색 쿼리 생성
-        queries = _build_tavily_queries(tech, keyterms)
-        all_results = []
-        
-        for q in queries:
-            print(f"🌐 [Tavily] Searching: {q}")
-            try:
-                result = self.tavily.search(query=q, max_results=2)
-                all_results.extend(result.get("results", []))
-            except Exception as e:
-                print(f"  ⚠️ Tavily search failed for '{q}': {e}")
+        # 시장 데이터 검색 쿼리 생성 (기술명 쿼리를 미리 조회했다면 제외)
+        market_query = _build_tavily_market_query(tech, keyterms)
+        prefetched = state.get("prefetched_web_results")
+
+        if prefetched is None:
+            # ✅ 두 쿼리 동시 실행 (결과는 쿼리 순서대로 합침)
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                base_future = ex.submit(
+                    self._tavily_search, _build_tavily_base_query(tech), TAVILY_BASE_MAX_RESULTS
+                )
+                all_results = self._tavily_search(market_query, TAVILY_MARKET_MAX_RESULTS)
+                all_results.extend(base_future.result())
+        else:
+            all_results = self._tavily_search(market_query, TAVILY_MARKET_MAX_RESULTS)
+            all_results.extend(prefetched)
         
-        print(f"  ✅ Retrieved {len(all_results)} web search results")
+        logger.info("  ✅ Retrieved %s web search results", len(all_results))
         state["web_search_results"] = all_results
         return state
 
+    def _tavily_search(self, query: str, max_results: int = TAVILY_BASE_MAX_RESULTS) -> List[Dict[str, Any]]:
+        cached = _tavily_cache_load(query, max_results)
+        if cached is not None:
+            logger.info("🌐 [Tavily] Cache hit: %s", query)
+            return cached
+
+        logger.info("🌐 [Tavily] Searching: %s", query)
+        for attempt in range(MAX_429_RETRIES + 1):
+            try:
+                # ✅ SerpAPI와 같은 전역 동시성 슬롯 + 호스트별 속도 제한 공유
+                with http_slot(TAVILY_HOST):
+                    response = self.tavily.search(query=query, max_results=max_results)
+                results = list(response.get("results", []))
+                break
+            except Exception as e:
+                if _tavily_error_status(e) not in RETRY_STATUSES or attempt == MAX_429_RETRIES:
+                    logger.warning("  ⚠️ Tavily search failed for '%s': %s", query, e)
+                    return []
+                # 429/5xx: 슬롯 반납 후 Retry-After 또는 지수 백오프
+                time.sleep(backoff_seconds(getattr(getattr(e, "response", None), "headers", None), attempt))
+        if results:
+            _tavily_cache_store(query, max_results, results)
+        return results
+
     def _node_synthesize(self, state: MarketState) -> MarketState:
         """시장성 평가 종합 노드"""
+        from langchain_core.prompts import ChatPromptTemplate
+
         tech = state["tech_name"]
         pi = state.get("first_item") or {}
         
@@ -296,20 +536,19 @@ class MarketSizeGrowthAgent:
         rag_docs = state.get("retrieved_docs", [])
         web_results = state.get("web_search_results", [])
         
-        # 컨텍스트 구성 (안전하게 처리)
-        rag_text = ""
+        # 컨텍스트 구성 (안전하게 처리, 4000자에서 잘리므로 문서당 앞부분만 사용)
+        rag_parts = []
         for doc in rag_docs:
             if hasattr(doc, 'page_content'):
-                rag_text += doc.page_content + "\n\n"
+                rag_parts.append(doc.page_content[:4000])
             elif isinstance(doc, dict):
-                rag_text += doc.get('page_content', '') + "\n\n"
-        rag_text = rag_text[:4000]
+                rag_parts.append(doc.get('page_content', '')[:4000])
+        rag_text = "".join(part + "\n\n" for part in rag_parts)[:4000]
         
-        web_text = ""
-        for idx, result in enumerate(web_results[:6]):
-            content = result.get("content", "")
-            url = result.get("url", "")
-            web_text += f"[Web Source {idx+1}] {url}\n{content[:500]}\n\n"
+        web_text = "".join(
+            f"[Web Source {idx+1}] {result.get('url', '')}\n{result.get('content', '')[:500]}\n\n"
+            for idx, result in enumerate(web_results[:6])
+        )
         
         sources = _collect_sources(rag_docs, web_results)
 
@@ -412,13 +651,13 @@ class MarketSizeGrowthAgent:
             state["demand_signals"] = result["demand_signals"]
             state["sources"] = sources
             
-            print(f"  ✅ Evaluation complete:")
-            print(f"     - Potential: {output.commercialization_potential}")
-            print(f"     - Total Score: {result['market_score']:.3f}")
-            print(f"     - Sources: {len(sources)} items")
+            logger.info("  ✅ Evaluation complete:")
+            logger.info("     - Potential: %s", output.commercialization_potential)
+            logger.info("     - Total Score: %.3f", result["market_score"])
+            logger.info("     - Sources: %s items", len(sources))
             
         except Exception as e:
-            print(f"  ❌ Synthesis failed: {e}")
+            logger.warning("  ❌ Synthesis failed: %s", e)
             state["patent_id"] = patent_id
             state["patent_title"] = title
             state["error"] = str(e)
@@ -429,23 +668,32 @@ class MarketSizeGrowthAgent:
 
     def evaluate_market(self) -> Dict[str, Any]:
         """시장성 평가 실행"""
-        print("=" * 80)
-        print(f"🚀 Patent Market Evaluation (RAG + Tavily): {self.tech_name}")
-        print("=" * 80)
+        logger.debug(_RULE)
+        logger.info("🚀 Patent Market Evaluation (RAG + Tavily): %s", self.tech_name)
+        logger.debug(_RULE)
 
         title = self.patent_info.get("title", "")
         abstract = self.patent_info.get("abstract", "")
         
-        # Abstract에서 핵심 기술 키워드 추출
-        print("📝 Extracting key technical terms from abstract...")
-        keyterms = _extract_keyterms_from_abstract(
-            self.llm, title, abstract, max_terms=8
-        )
-        print(f"  ✅ Extracted keyterms: {keyterms}")
+        # ✅ 키워드가 필요 없는 기술명 Tavily 쿼리는 키워드 추출(LLM)과 동시에 실행
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            base_future = (
+                ex.submit(self._tavily_search, _build_tavily_base_query(self.tech_name))
+                if self.tavily else None
+            )
+
+            # Abstract에서 핵심 기술 키워드 추출
+            logger.info("📝 Extracting key technical terms from abstract...")
+            keyterms = _extract_keyterms_from_abstract(
+                self.llm, title, abstract, max_terms=8
+            )
+            logger.info("  ✅ Extracted keyterms: %s", keyterms)
+
+            prefetched = base_future.result() if base_future else None
         
         # RAG 검색 쿼리 구성
         query = _build_rag_query(self.tech_name, keyterms)
-        print(f"  🔎 RAG query: {query}")
+        logger.info("  🔎 RAG query: %s", query)
 
         # State 초기화
         init_state: MarketState = {
@@ -456,6 +704,8 @@ class MarketSizeGrowthAgent:
             "retrieved_docs": [],
             "web_search_results": [],
         }
+        if prefetched is not None:
+            init_state["prefetched_web_results"] = prefetched
 
         # Graph 실행
         final_state = self.graph.invoke(
@@ -484,10 +734,10 @@ class MarketSizeGrowthAgent:
         output_path = self._save(result)
         result["market_output_path"] = str(output_path)
 
-        print("=" * 80)
-        print("📊 Final Market Evaluation Result")
-        print("=" * 80)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        logger.debug(_RULE)
+        logger.info("📊 Final Market Evaluation Result")
+        logger.debug(_RULE)
+        logger.info("%s", json.dumps(result, ensure_ascii=False, indent=2))
         
         return result
 
@@ -497,17 +747,19 @@ class MarketSizeGrowthAgent:
         filename = f"market_eval_{self.tech_name}_{timestamp}.json"
         output_path = self.output_dir / filename
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        json_write(str(output_path), result, indent=True)
         
-        print(f"💾 Saved to: {output_path}")
+        logger.info("💾 Saved to: %s", output_path)
         return output_path
 
 
 # ===== CLI =====
 if __name__ == "__main__":
     import argparse
-    
+
+    # 에이전트 로그(logging) 출력 설정 (LOG_LEVEL=DEBUG 시 단계 구분선까지 출력)
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(), format="%(message)s")
+
     parser = argparse.ArgumentParser(
         description="시장성 평가 Agent (RAG + Tavily Web Search)"
     )
@@ -516,8 +768,8 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     # 특허 정보 로드
-    with open(args.patent_json, "r", encoding="utf-8") as f:
-        patent_data = json.load(f)
+    with open(args.patent_json, "rb") as f:
+        patent_data = json_loads(f.read())
     
     first_patent = (patent_data.get("items") or [{}])[0]
 
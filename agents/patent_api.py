@@ -0,0 +1,626 @@
+"""
+SerpAPI (Google Patents) 공용 클라이언트
+
+검색/상세 조회 + 커넥션 풀 세션 + 디스크/메모리 캐시 + 속도 제한을 한 곳에서 관리
+patent_search_agent / patent_originality_agent 모두 이 모듈을 통해 호출
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import logging
+import asyncio
+import re
+import random
+import hashlib
+import threading
+import requests
+from collections import OrderedDict
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+from dotenv import load_dotenv
+
+try:
+    import httpx
+    _HTTPX_OK = True
+except Exception:
+    _HTTPX_OK = False
+
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 지원용)
+    _H2_OK = True
+except Exception:
+    _H2_OK = False
+
+try:
+    import orjson
+    _ORJSON_OK = True
+except Exception:
+    _ORJSON_OK = False
+
+# ✅ 실행 환경에서 이미 키를 주입했다면 .env 파일 탐색 생략
+if not os.getenv("SERPAPI_KEY"):
+    load_dotenv()
+
+logger = logging.getLogger(__name__)
+SERPAPI_KEY = os.getenv("SERPAPI_KEY")
+HAS_SERPAPI_KEY = bool(SERPAPI_KEY)  # 키 설정 여부 (호출마다 재검사하지 않도록 1회 계산)
+BASE_URL = "https://serpapi.com/search.json"
+# ✅ 고정 요청 파라미터 템플릿 (읽기 전용, 호출마다 {**템플릿, ...}로 확장)
+SEARCH_BASE_PARAMS = MappingProxyType({"engine": "google_patents", "api_key": SERPAPI_KEY})
+_DETAILS_BASE_PARAMS = MappingProxyType({"engine": "google_patents_details", "api_key": SERPAPI_KEY})
+
+# ========== 🔧 SerpAPI 호출 설정 ==========
+MAX_CONCURRENT_REQUESTS = 3  # 동시 상세 조회 수 (SerpAPI 속도 제한 고려)
+HTTP_POOL_SIZE = 16  # keep-alive 커넥션 풀 크기 (requests 세션 / httpx 클라이언트 공용)
+JSON_WRITE_BUFFER = 1 << 16  # 표준 json 폴백 쓰기 버퍼 (바이트)
+CONNECT_TIMEOUT = 5  # 연결 타임아웃 (죽은 커넥션은 빨리 포기)
+READ_TIMEOUT = 30    # 응답 대기 타임아웃 (SerpAPI 검색은 수 초 걸릴 수 있음)
+SERPAPI_RPS = float(os.getenv("SERPAPI_RPS", "3"))  # 초당 최대 SerpAPI 호출 수 (전 호출 지점 공용)
+SERPAPI_BURST = float(os.getenv("SERPAPI_BURST", "0")) or None  # 순간 허용 호출 수 (미설정 시 1초분)
+HTTP_CONCURRENCY = int(os.getenv("HTTP_CONCURRENCY", "8"))  # 프로세스 전체 동시 외부 호출 수 (SerpAPI + Tavily)
+HTTP_HOST_RPS = float(os.getenv("HTTP_HOST_RPS", "5"))      # SerpAPI 외 호스트의 초당 최대 호출 수
+MAX_429_RETRIES = 3                                         # 429/5xx 재시도 횟수 (SerpAPI 동기/비동기 + Tavily 공용, 속도 제한 적용)
+HTTP_SLOT_POLL_SECONDS = 0.05                               # 비동기 호출의 전역 슬롯 대기 폴링 간격
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})       # 재시도 대상 HTTP 상태 코드
+# ===========================================
+
+# ========== 💾 SerpAPI 응답 캐시 설정 ==========
+# SERPAPI_NO_CACHE=1 → 디스크 캐시를 건너뛰고 강제로 새로 조회
+USE_DISK_CACHE = os.getenv("SERPAPI_NO_CACHE", "").lower() not in ("1", "true", "yes")
+# 디스크 캐시 TTL (초, 환경변수로 조정 가능)
+CACHE_TTL_SECONDS = int(os.getenv("SERPAPI_DETAILS_CACHE_TTL", str(86400 * 30)))  # 30일 (공개된 특허 상세 정보는 사실상 불변)
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SERPAPI_SEARCH_CACHE_TTL", "86400"))     # 1일 (검색 결과는 신규 특허 반영 위해 짧게)
+MEMO_MAXSIZE = 1024               # 프로세스 내 검색 결과 메모리 캐시 최대 항목 수
+DETAILS_MEMO_MAXSIZE = 4096       # 프로세스 내 상세 정보 메모리 캐시 최대 항목 수 (인용/확장 특허 중복 흡수)
+DETAILS_MEMO_TTL_SECONDS = 86400  # 상세 정보 메모리 캐시 TTL
+SEARCH_MEMO_TTL_SECONDS = 900     # 검색 결과 메모리 캐시 TTL (LangGraph 재실행 중복 검색 흡수)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "serpapi")
+# ===========================================
+
+# ✅ 커넥션 풀 재사용 세션 (TLS 핸드셰이크 1회 + 연결 오류 자동 재시도)
+# Accept-Encoding: urllib3가 디코딩 가능한 방식만 광고 (brotli/zstandard 설치 시 br/zstd 자동 추가)
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept-Encoding": ACCEPT_ENCODING})
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        # 연결 실패만 어댑터 계층에서 재시도 (요청이 서버에 닿지 않았으므로 속도 제한과 무관)
+        # 429/5xx 상태 코드 재시도는 _serpapi_get 루프에서 토큰 버킷/슬롯을 거쳐 처리
+        max_retries=Retry(
+            total=MAX_429_RETRIES,
+            connect=MAX_429_RETRIES,
+            read=0,
+            status=0,
+            backoff_factor=0.5,
+            allowed_methods=frozenset({"GET"}),
+        ),
+    ),
+)
+
+
+class _TokenBucket:
+    """스레드 안전 토큰 버킷 (동기/비동기 호출 지점 공용)"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = max(rate, 0.001)
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """토큰 1개 예약 → 대기해야 할 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# ✅ 고정 sleep 대신 실제 호출 속도만 제한 (응답이 빠르면 대기 없음)
+_RATE_LIMITER = _TokenBucket(SERPAPI_RPS, capacity=SERPAPI_BURST)
+SERPAPI_HOST = "serpapi.com"
+
+@lru_cache(maxsize=1)
+def _h2_client() -> Optional["httpx.Client"]:
+    """
+    동기 SerpAPI 호출용 공유 HTTP/2 클라이언트 (h2 설치 시에만, 없으면 None → requests 세션 사용)
+    검색 + 상세 조회가 하나의 TLS 연결에서 멀티플렉싱됨
+    """
+    if not (_HTTPX_OK and _H2_OK):
+        return None
+    return httpx.Client(
+        http2=True,
+        timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE),
+    )
+
+
+# ✅ 전역 동시 호출 슬롯 + 호스트별 토큰 버킷 (동기/비동기, SerpAPI/Tavily 공용)
+_HTTP_SLOTS = threading.BoundedSemaphore(max(1, HTTP_CONCURRENCY))
+_HOST_LIMITERS: Dict[str, _TokenBucket] = {SERPAPI_HOST: _RATE_LIMITER}
+_HOST_LIMITERS_LOCK = threading.Lock()
+
+
+def _host_limiter(host: str) -> _TokenBucket:
+    with _HOST_LIMITERS_LOCK:
+        limiter = _HOST_LIMITERS.get(host)
+        if limiter is None:
+            limiter = _HOST_LIMITERS[host] = _TokenBucket(HTTP_HOST_RPS)
+        return limiter
+
+
+def backoff_seconds(headers: Any, attempt: int) -> float:
+    """429/5xx 재시도 대기 시간 (Retry-After 헤더 우선, 없으면 지수 백오프 + 지터, 최대 30초)"""
+    retry_after = (headers or {}).get("Retry-After")
+    try:
+        if retry_after is not None:
+            return min(30.0, max(0.0, float(retry_after)))
+    except ValueError:
+        pass  # HTTP-date 형식은 무시하고 백오프 사용
+    return min(30.0, 2 ** attempt + random.random())
+
+
+@contextmanager
+def http_slot(host: str) -> Iterator[None]:
+    """
+    외부 HTTP 호출 1건 (호스트 속도 제한 대기 → 전역 동시성 슬롯 확보)
+    속도 제한 대기 중에는 슬롯을 잡지 않음 → 다른 호스트 호출이 슬롯을 계속 사용
+    """
+    _host_limiter(host).acquire()
+    with _HTTP_SLOTS:
+        yield
+
+
+@asynccontextmanager
+async def http_slot_async(host: str) -> AsyncIterator[None]:
+    """
+    http_slot의 비동기 버전 (동기 호출과 같은 슬롯 공유)
+    슬롯은 논블로킹 획득 + 짧은 폴링 → 대기 중 취소돼도 잡힌 슬롯이 남지 않음
+    """
+    await _host_limiter(host).acquire_async()
+    while not _HTTP_SLOTS.acquire(blocking=False):
+        await asyncio.sleep(HTTP_SLOT_POLL_SECONDS)
+    try:
+        yield
+    finally:
+        _HTTP_SLOTS.release()
+
+
+def json_loads(raw: Any) -> Any:
+    """bytes/str → JSON (orjson 우선, 없거나 orjson이 거부하면 표준 json)"""
+    if _ORJSON_OK:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # 짝 없는 서로게이트 등 orjson이 더 엄격한 입력 → 표준 json으로 재시도
+    return json.loads(raw)
+
+
+def _serpapi_get(params: Dict[str, Any]) -> bytes:
+    """
+    SerpAPI 동기 GET → 응답 본문 (HTTP/2 공유 클라이언트 우선, 없으면 requests 세션)
+    오류는 어느 경로든 requests.RequestException으로 전달 (호출부 예외 처리 공용)
+    """
+    client = _h2_client()
+    for attempt in range(MAX_429_RETRIES + 1):
+        # 매 시도마다 슬롯/토큰을 다시 받음 → 재시도도 SERPAPI_RPS 한도에 포함
+        with http_slot(SERPAPI_HOST):
+            if client is None:
+                resp = _SESSION.get(BASE_URL, params=params, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+            else:
+                try:
+                    resp = client.get(BASE_URL, params=params)
+                except httpx.HTTPError as e:
+                    raise requests.ConnectionError(str(e)) from e
+        if resp.status_code not in RETRY_STATUSES or attempt == MAX_429_RETRIES:
+            break
+        # 슬롯 반납 후 대기 (Retry-After 또는 지수 백오프)
+        time.sleep(backoff_seconds(resp.headers, attempt))
+    if resp.status_code >= 400:
+        raise requests.HTTPError(f"{resp.status_code} Error for url: {BASE_URL}")
+    return resp.content
+
+
+def json_write(path: str, data: Any, indent: bool = False) -> None:
+    """
+    JSON 파일 저장 (orjson 우선, 없으면 표준 json)
+    임시 파일에 쓴 뒤 os.replace로 교체 → 중단/동시 읽기에도 잘린 파일이 보이지 않음
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if _ORJSON_OK:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(data, option=option))
+        else:
+            # json.dump는 작은 조각을 여러 번 write → 64KB 버퍼로 시스템 콜 횟수 축소
+            with open(tmp_path, "w", encoding="utf-8", buffering=JSON_WRITE_BUFFER) as f:
+                json.dump(data, f, ensure_ascii=False, indent=2 if indent else None)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class _TTLCache:
+    """스레드 안전 LRU + TTL 메모리 캐시"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._d: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._d.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._d[key]
+                return None
+            self._d.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._d[key] = (time.monotonic() + self._ttl, value)
+            self._d.move_to_end(key)
+            while len(self._d) > self._maxsize:
+                self._d.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._d.clear()
+
+
+# 프로세스 내 캐시 (동기/비동기 조회 공용)
+_DETAILS_MEMO = _TTLCache(DETAILS_MEMO_MAXSIZE, DETAILS_MEMO_TTL_SECONDS)
+_SEARCH_MEMO = _TTLCache(MEMO_MAXSIZE, SEARCH_MEMO_TTL_SECONDS)
+
+
+def _cache_path(namespace: str, key: str) -> str:
+    safe_key = ''.join(ch if (ch.isalnum() or ch in ('_', '-')) else '_' for ch in key)
+    return os.path.join(CACHE_DIR, namespace, f"{safe_key}.json")
+
+
+def _cache_load(
+    namespace: str, key: str, ttl: int = CACHE_TTL_SECONDS
+) -> Optional[Dict[str, Any]]:
+    """디스크 캐시 조회 (TTL 만료 시 None)"""
+    if not USE_DISK_CACHE:
+        return None
+    path = _cache_path(namespace, key)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, "rb") as f:
+            return json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_store(namespace: str, key: str, data: Dict[str, Any]) -> None:
+    """디스크 캐시 저장 (json_write 원자적 교체, 실패해도 파이프라인은 계속 진행)"""
+    if not USE_DISK_CACHE:
+        return
+    path = _cache_path(namespace, key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        json_write(path, data)
+    except (OSError, TypeError) as e:
+        logger.warning("   ⚠️ Cache write failed: %s", e)
+
+
+def _params_cache_key(params: Dict[str, Any]) -> str:
+    """api_key를 제외한 검색 파라미터 → sha256 키"""
+    p = {k: v for k, v in params.items() if k != "api_key"}
+    return hashlib.sha256(json.dumps(p, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _get_cached_details(patent_id: str) -> Optional[Dict[str, Any]]:
+    data = _DETAILS_MEMO.get(patent_id)
+    if data is None:
+        data = _cache_load("details", patent_id)
+        if data is not None:
+            _DETAILS_MEMO.set(patent_id, data)
+    return data
+
+
+def _remember_details(patent_id: str, data: Dict[str, Any]) -> None:
+    _DETAILS_MEMO.set(patent_id, data)
+    _cache_store("details", patent_id, data)
+
+
+def fetch_patent_details(patent_id: str) -> Optional[Dict[str, Any]]:
+    """특허 상세 정보 조회 (메모리 → 디스크 캐시 → SerpAPI 순)"""
+    if not HAS_SERPAPI_KEY or not patent_id:
+        return None
+
+    cached = _get_cached_details(patent_id)
+    if cached is not None:
+        return cached
+    
+    try:
+        data = json_loads(_serpapi_get({**_DETAILS_BASE_PARAMS, "patent_id": patent_id}))
+        
+        if "error" in data:
+            logger.warning("   ❌ API error for %s: %s", patent_id, data.get('error'))
+            return None
+            
+        _remember_details(patent_id, data)
+        return data
+    except Exception as e:
+        logger.warning("   ❌ Failed to fetch %s: %s", patent_id, e)
+        return None
+
+
+async def fetch_patent_details_async(
+    client: "httpx.AsyncClient",
+    patent_id: str,
+    sem: asyncio.Semaphore,
+) -> Optional[Dict[str, Any]]:
+    """특허 상세 정보 비동기 조회 (세마포어로 동시 요청 수 제한)"""
+    if not patent_id:
+        return None
+
+    cached = _get_cached_details(patent_id)
+    if cached is not None:
+        return cached
+
+    async with sem:
+        try:
+            for attempt in range(MAX_429_RETRIES + 1):
+                async with http_slot_async(SERPAPI_HOST):
+                    r = await client.get(
+                        BASE_URL,
+                        params={**_DETAILS_BASE_PARAMS, "patent_id": patent_id},
+                    )
+                if r.status_code not in RETRY_STATUSES or attempt == MAX_429_RETRIES:
+                    break
+                # 429/5xx: Retry-After 또는 지수 백오프 (슬롯 반납 후 대기 → 다른 호스트 호출은 계속 진행)
+                await asyncio.sleep(backoff_seconds(r.headers, attempt))
+            r.raise_for_status()
+            data = json_loads(r.content)
+
+            if "error" in data:
+                logger.warning("   ❌ API error for %s: %s", patent_id, data.get('error'))
+                return None
+
+            _remember_details(patent_id, data)
+            return data
+        except Exception as e:
+            logger.warning("   ❌ Failed to fetch %s: %s", patent_id, e)
+            return None
+
+
+# on_result(index, patent_id, details): 응답이 도착하는 즉시 호출되는 콜백
+DetailsCallback = Callable[[int, str, Optional[Dict[str, Any]]], None]
+
+
+async def fetch_many_details_async(
+    patent_ids: List[str],
+    on_result: Optional[DetailsCallback] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    여러 특허 상세 정보를 하나의 AsyncClient로 동시 조회
+    as_completed로 먼저 끝난 응답부터 on_result 처리 (느린 응답 대기 시간 은닉)
+    같은 ID가 여러 번 있어도 요청은 1회 (결과는 모든 위치에 채움)
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    limits = httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(patent_ids)
+    positions = _positions_by_id(patent_ids)
+
+    async def _fetch(pid: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        return pid, await fetch_patent_details_async(client, pid, sem)
+
+    # ✅ h2 설치 시 HTTP/2 멀티플렉싱 (동시 요청을 하나의 TLS 연결로 처리)
+    timeout = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+    async with httpx.AsyncClient(limits=limits, http2=_H2_OK, timeout=timeout) as client:
+        tasks = [asyncio.create_task(_fetch(pid)) for pid in positions]
+        for fut in asyncio.as_completed(tasks):
+            pid, data = await fut
+            _deliver(results, positions[pid], pid, data, on_result)
+    return results
+
+
+def _positions_by_id(patent_ids: List[str]) -> Dict[str, List[int]]:
+    """특허 ID → 입력 목록 내 위치들 (첫 등장 순서 유지)"""
+    positions: Dict[str, List[int]] = {}
+    for i, pid in enumerate(patent_ids):
+        positions.setdefault(pid, []).append(i)
+    return positions
+
+
+def _deliver(
+    results: List[Optional[Dict[str, Any]]],
+    indexes: List[int],
+    patent_id: str,
+    data: Optional[Dict[str, Any]],
+    on_result: Optional[DetailsCallback],
+) -> None:
+    for i in indexes:
+        results[i] = data
+        if on_result:
+            on_result(i, patent_id, data)
+
+
+def _has_running_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def fetch_many_details(
+    patent_ids: List[str],
+    on_result: Optional[DetailsCallback] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    여러 특허 상세 정보 조회 (반환값은 입력 순서 유지)
+    httpx가 없거나 이미 이벤트 루프 안에서 호출된 경우 스레드 풀 동시 조회로 폴백
+    """
+    if not patent_ids:
+        return []
+    if _HTTPX_OK and not _has_running_loop():
+        return asyncio.run(fetch_many_details_async(patent_ids, on_result))
+    results: List[Optional[Dict[str, Any]]] = [None] * len(patent_ids)
+    positions = _positions_by_id(patent_ids)
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as ex:
+        futures = {ex.submit(fetch_patent_details, pid): pid for pid in positions}
+        # on_result는 호출 스레드에서 도착 순서대로 실행 (콜백 쪽 락 불필요)
+        for fut in as_completed(futures):
+            pid = futures[fut]
+            _deliver(results, positions[pid], pid, fut.result(), on_result)
+    return results
+
+
+def clear_details_cache(disk: bool = False) -> None:
+    """특허 상세 정보 캐시 초기화 (장시간 실행 서비스용, disk=True면 디스크 캐시도 삭제)"""
+    _DETAILS_MEMO.clear()
+    if not disk:
+        return
+    details_dir = os.path.join(CACHE_DIR, "details")
+    try:
+        names = os.listdir(details_dir)
+    except OSError:
+        return
+    for name in names:
+        try:
+            os.remove(os.path.join(details_dir, name))
+        except OSError:
+            pass
+
+
+# 검색 응답에서 에이전트가 실제로 읽는 필드 (search_metadata/pagination 등은 버림)
+SEARCH_RESPONSE_KEYS = ("organic_results", "error")
+
+
+def search_google_patents(
+    params: Dict[str, Any], force_refresh: bool = False
+) -> Dict[str, Any]:
+    """
+    Google Patents 검색 (메모리 → 디스크 캐시 → SerpAPI 순)
+    api_key가 없으면 자동으로 채움, HTTP 오류는 requests.RequestException으로 전달
+    SerpAPI가 "error"를 반환한 응답은 캐시하지 않음
+    반환/캐시되는 응답은 SEARCH_RESPONSE_KEYS 필드만 포함 (메모리/디스크 캐시 크기 축소)
+
+    force_refresh=True → 로컬 캐시와 SerpAPI 서버 캐시 모두 건너뛰고 새로 조회
+    """
+    params = {**params, "api_key": params.get("api_key") or SERPAPI_KEY}
+    cache_key = _params_cache_key(params)
+    if not force_refresh:
+        data = _SEARCH_MEMO.get(cache_key)
+        if data is None:
+            data = _cache_load("search", cache_key, ttl=SEARCH_CACHE_TTL_SECONDS)
+            if data is not None:
+                _SEARCH_MEMO.set(cache_key, data)
+        if data is not None:
+            return data
+
+    # ✅ SerpAPI 서버 측 캐시 재사용 (동일 검색은 캐시 응답 → 더 빠르고 크레딧 차감 없음)
+    params["no_cache"] = "true" if force_refresh else "false"
+
+    raw = json_loads(_serpapi_get(params))
+    data = {k: raw[k] for k in SEARCH_RESPONSE_KEYS if k in raw}
+    if "error" not in data:
+        _SEARCH_MEMO.set(cache_key, data)
+        _cache_store("search", cache_key, data)
+    return data
+
+
+def clamp_num(n: int) -> int:
+    return max(10, min(int(n), 100))
+
+
+def clamp_page(p: int) -> int:
+    return max(1, int(p))
+
+
+def prepared_url(params: Dict[str, Any], hide_key: bool = True) -> str:
+    # Request().prepare() 대신 urlencode로 직접 조립 (요청마다 객체 생성 X)
+    p = {k: v for k, v in params.items() if not (hide_key and k == "api_key")}
+    return f"{BASE_URL}?{urlencode(p, doseq=True)}"  # 리스트 값은 requests와 같이 key=a&key=b
+
+
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w.-]+")
+
+
+def safe_filename(name: str, default: str = "patent", max_len: int = 64) -> str:
+    """사용자 입력(tech_name 등) → 파일명 안전 문자열 ('/', 공백, 제어문자 등은 '_')"""
+    return _UNSAFE_FILENAME_RE.sub("_", name or "")[:max_len] or default
+
+
+def normalize_item(it: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": it.get("title"),
+        "abstract": it.get("snippet"),
+        "patent_id": it.get("patent_id"),
+        "publication_number": it.get("publication_number"),
+        "publication_date": it.get("publication_date"),
+        "filing_date": it.get("filing_date"),
+        "priority_date": it.get("priority_date"),
+        "assignee": it.get("assignee"),
+        "inventor": it.get("inventor"),
+        "link": it.get("patent_link"),
+        "pdf": it.get("pdf"),
+    }
+
+
+__all__ = [
+    "SERPAPI_KEY",
+    "HAS_SERPAPI_KEY",
+    "BASE_URL",
+    "SEARCH_BASE_PARAMS",
+    "CACHE_DIR",
+    "MAX_CONCURRENT_REQUESTS",
+    "HTTP_CONCURRENCY",
+    "MAX_429_RETRIES",
+    "RETRY_STATUSES",
+    "backoff_seconds",
+    "http_slot",
+    "http_slot_async",
+    "DetailsCallback",
+    "json_loads",
+    "json_write",
+    "fetch_patent_details",
+    "fetch_patent_details_async",
+    "fetch_many_details",
+    "clear_details_cache",
+    "search_google_patents",
+    "clamp_num",
+    "clamp_page",
+    "prepared_url",
+    "normalize_item",
+    "safe_filename",
+]
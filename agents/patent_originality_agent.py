@@ -1,18 +1,32 @@
 ﻿from __future__ import annotations
 
 import os
-import json
-import time
-import requests
+import re
+import importlib.util
+import logging
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from collections import Counter
-from typing import Any, Dict, List, Optional, TypedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, TypedDict
 from dotenv import load_dotenv
 
-try:
+# OpenAI SDK는 무거워서 첫 GPT 호출 시점에 import (설치 여부만 미리 확인)
+_OPENAI_OK = importlib.util.find_spec("openai") is not None
+if TYPE_CHECKING:
     from openai import OpenAI
-    _OPENAI_OK = True
-except Exception:
-    _OPENAI_OK = False
+
+from agents.patent_api import (
+    HAS_SERPAPI_KEY,
+    SEARCH_BASE_PARAMS,
+    CACHE_DIR,
+    MAX_CONCURRENT_REQUESTS,
+    fetch_patent_details,
+    fetch_many_details,
+    search_google_patents,
+    json_loads,
+    json_write,
+)
 
 try:
     from state.originality_state import OriginalityState
@@ -29,8 +43,9 @@ except Exception:
         error: str
 
 load_dotenv()
-SERPAPI_KEY = os.getenv("SERPAPI_KEY")
-BASE_URL = "https://serpapi.com/search.json"
+
+logger = logging.getLogger(__name__)
+_RULE = "=" * 70  # 단계 구분선 (DEBUG 레벨에서만 출력)
 
 # ========== 🔧 API 호출 제한 설정 ==========
 MAX_CITATIONS = 3           # 인용 특허 개수 (기본: 5 → 3)
@@ -38,37 +53,66 @@ TOP_K_CPC = 3              # Top CPC 개수 (기본: 5 → 3)
 PATENTS_PER_KEYWORD = 10   # 키워드당 검색 특허 (최소 10 - SerpAPI 요구사항)
 MAX_EXPANDED_PATENTS = 15  # 확장 특허 최대 개수 (신규 추가)
 MAX_CPC_PER_PATENT = 30    # 특허당 최대 CPC 개수 (편향 방지)
+EARLY_EXIT_ORIGINALITY = 0.85   # 인용 특허만으로 이 값 이상이면 확장 생략
+# 확장 생략에 필요한 최소 고유 CPC 수 (CPC_SCORE_LEVEL 단위: subclass는 인용 3건 기준 한 자릿수가 현실적)
+EARLY_EXIT_MIN_UNIQUE_CPC = {"subclass": 8, "full": 20}
+CPC_SCORE_LEVEL = "subclass"    # 독창성 계산 CPC 단위 ("subclass": H01L / "full": H01L25/065)
 
 # API 호출 예상: 1 + 3 + 3 + 3 + 15 = 25회 (기존 36회에서 11회 절약)
 # ===========================================
 
+# SerpAPI 세션/캐시/속도 제한 설정은 agents/patent_api.py 참고
 
-def _fetch_patent_details(patent_id: str) -> Optional[Dict[str, Any]]:
-    """특허 상세 정보 조회"""
-    if not patent_id:
-        return None
-    
-    try:
-        r = requests.get(
-            BASE_URL,
-            params={
-                "engine": "google_patents_details",
-                "patent_id": patent_id,
-                "api_key": SERPAPI_KEY,
-            },
-            timeout=30,
-        )
-        r.raise_for_status()
-        data = r.json()
-        
-        if "error" in data:
-            print(f"   ❌ API error for {patent_id}: {data.get('error')}")
-            return None
-            
-        return data
-    except Exception as e:
-        print(f"   ❌ Failed to fetch {patent_id}: {e}")
-        return None
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output", "originality")
+
+
+@lru_cache(maxsize=1)
+def _output_dir() -> str:
+    """출력 폴더 생성은 프로세스당 1회"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    return OUTPUT_DIR
+
+
+def _collect_cpc_and_metadata(
+    patent_ids: List[str]
+) -> tuple[Counter, List[Dict[str, Any]]]:
+    """
+    상세 정보 조회 + CPC/메타데이터 추출을 응답 도착 순으로 파이프라인 처리
+    Counter 합산과 메타데이터 순서는 입력 순서 기준 (결과 결정성 유지)
+    """
+    slots: List[Optional[tuple]] = [None] * len(patent_ids)
+
+    def _on_result(i: int, pid: str, details: Optional[Dict[str, Any]]) -> None:
+        logger.info("   [%s/%s] %s", i + 1, len(patent_ids), pid)
+        if not details:
+            return
+
+        # CPC 코드 추출 (최대 개수 제한)
+        codes = [
+            cls["code"]
+            for cls in details.get("classifications") or ()
+            if cls.get("is_cpc") and cls.get("code")
+        ]
+        cpc_count = len(codes)
+        if cpc_count > MAX_CPC_PER_PATENT:
+            logger.info("       ✅ %s/%s CPC codes (limited)", MAX_CPC_PER_PATENT, cpc_count)
+        elif cpc_count > 0:
+            logger.info("       ✅ %s CPC codes", cpc_count)
+
+        # ✅ 메타데이터 저장
+        slots[i] = (codes[:MAX_CPC_PER_PATENT], _normalize_patent_metadata(details))
+
+    fetch_many_details(patent_ids, on_result=_on_result)
+
+    cpc_counter: Counter = Counter()
+    metadata: List[Dict[str, Any]] = []
+    for slot in slots:
+        if slot is None:
+            continue
+        codes, meta = slot
+        cpc_counter.update(codes)
+        metadata.append(meta)
+    return cpc_counter, metadata
 
 
 def _normalize_patent_metadata(details: Dict[str, Any]) -> Dict[str, Any]:
@@ -94,96 +138,161 @@ def _normalize_patent_metadata(details: Dict[str, Any]) -> Dict[str, Any]:
 def _collect_cpc_from_citations(
     patent_id: str, 
     max_refs: int = MAX_CITATIONS
-) -> tuple[List[str], List[str], List[Dict[str, Any]]]:
+) -> tuple[Counter, List[str], List[Dict[str, Any]]]:
     """
     인용 특허에서 CPC 수집 + 메타데이터 저장
     
     Returns:
-        (cpc_codes, citation_ids, citation_metadata)
+        (cpc_counter, citation_ids, citation_metadata)
     """
-    print(f"\n{'='*70}")
-    print(f"📋 Step 1: Collecting CPC from Citations")
-    print(f"{'='*70}")
-    print(f"   Target Patent: {patent_id}")
-    print(f"   Max Citations: {max_refs} (API 절약 모드)")
+    logger.debug(_RULE)
+    logger.info("📋 Step 1: Collecting CPC from Citations")
+    logger.debug(_RULE)
+    logger.info("   Target Patent: %s", patent_id)
+    logger.info("   Max Citations: %s (API 절약 모드)", max_refs)
     
-    details = _fetch_patent_details(patent_id)
+    details = fetch_patent_details(patent_id)
     if not details:
-        print("   ❌ Failed to fetch patent details")
-        return [], [], []
-
-    print(f"   ✅ Patent: {details.get('title', 'N/A')[:60]}...")
+        logger.warning("   ❌ Failed to fetch patent details")
+        return Counter(), [], []
+
+    citations = ((details.get("patent_citations") or {}).get("original") or [])[:max_refs]
+    citation_ids = [c.get("patent_id") for c in citations if c.get("patent_id")]
+
+    # ✅ 인용 ID가 확정되는 즉시 상세 조회 + CPC/메타데이터 추출을 백그라운드로 시작
+    #    (아래 상태 출력/검증 동안 네트워크 대기 진행)
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        citation_future = ex.submit(_collect_cpc_and_metadata, citation_ids) if citation_ids else None
+
+        logger.info("   ✅ Patent: %s...", details.get('title', 'N/A')[:60])
+        
+        if not details.get("patent_citations"):
+            logger.warning("   ⚠️ No 'patent_citations' field")
+            return Counter(), [], []
+        
+        if not citations:
+            logger.warning("   ⚠️ No backward citations")
+            return Counter(), [], []
+        
+        logger.info("   ✅ Found %s citations", len(citations))
+
+        # 인용 특허 상세 정보 동시 조회 결과 (도착 순 CPC/메타데이터 추출)
+        if citation_future is None:
+            cpc_counter, citation_metadata = Counter(), []
+        else:
+            cpc_counter, citation_metadata = citation_future.result()
+
+    logger.debug(_RULE)
+    logger.info("   📊 Summary:")
+    logger.info("      • Total CPC: %s", sum(cpc_counter.values()))
+    logger.info("      • Unique CPC: %s", len(cpc_counter))
+    logger.info("      • Citations processed: %s", len(citation_ids))
+    logger.info("      • Metadata saved: %s", len(citation_metadata))
+    logger.debug(_RULE)
     
-    patent_citations = details.get("patent_citations")
-    if not patent_citations:
-        print("   ⚠️ No 'patent_citations' field")
-        return [], [], []
-    
-    citations = patent_citations.get("original", [])[:max_refs]
-    if not citations:
-        print("   ⚠️ No backward citations")
-        return [], [], []
-    
-    print(f"   ✅ Found {len(citations)} citations\n")
+    return cpc_counter, citation_ids, citation_metadata
+
+
+# ========== 🗂️ CPC → 키워드 캐시 ==========
+# 정확한 CPC 코드 + 메인 그룹 prefix(예: H01L25/065 → H01L25) 두 단계로 조회
+# 형제 코드(H01L25/0657, H01L25/10 등)는 prefix 키워드를 재사용하여 GPT 호출 생략
+CPC_KEYWORD_CACHE_PATH = os.path.join(os.path.dirname(CACHE_DIR), "cpc_keywords.json")
+DEFAULT_CPC_KEYWORDS = "semiconductor device technology"
+
+# GPT 변환 실패 시 CPC 서브클래스(앞 4자리) → 기본 키워드 (O(1) 조회, 항목 추가만으로 확장)
+_CPC_FALLBACK_KEYWORDS: Dict[str, str] = {
+    "H01L": "semiconductor device package",
+    "H10B": "memory device structure",
+    "H05K": "printed circuit board",
+    "G06F": "computing processor",
+    "G06N": "neural network accelerator",
+    "G06T": "image processing hardware",
+    "G11C": "memory storage",
+    "H03K": "logic circuit switching",
+    "H03M": "data encoding conversion",
+    "H04L": "data transmission network",
+}
+
+
+def _load_cpc_keyword_cache() -> Dict[str, str]:
+    try:
+        with open(CPC_KEYWORD_CACHE_PATH, "rb") as f:
+            data = json_loads(f.read())
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
 
-    all_cpc_codes = []
-    citation_ids = []
-    citation_metadata = []  # ✅ 메타데이터 저장
 
-    for i, citation in enumerate(citations, start=1):
-        cid = citation.get("patent_id")
-        if not cid:
-            continue
-        
-        citation_ids.append(cid)
-        print(f"   [{i}/{len(citations)}] {cid}")
-        
-        cit_details = _fetch_patent_details(cid)
-        if not cit_details:
-            continue
-        
-        # ✅ 메타데이터 저장
-        citation_metadata.append(_normalize_patent_metadata(cit_details))
-        
-        # CPC 코드 추출 (최대 개수 제한)
-        classifications = cit_details.get("classifications", []) or []
-        cpc_count = 0
-        cpc_collected = 0
-        for cls in classifications:
-            if cls.get("is_cpc") and cls.get("code"):
-                cpc_count += 1
-                # ✅ 최대 개수 제한
-                if cpc_collected < MAX_CPC_PER_PATENT:
-                    all_cpc_codes.append(cls["code"])
-                    cpc_collected += 1
-        
-        if cpc_count > 0:
-            if cpc_count > MAX_CPC_PER_PATENT:
-                print(f"       ✅ {cpc_collected}/{cpc_count} CPC codes (limited)")
-            else:
-                print(f"       ✅ {cpc_count} CPC codes")
-        
-        time.sleep(0.3)
-
-    print(f"\n{'='*70}")
-    print(f"   📊 Summary:")
-    print(f"      • Total CPC: {len(all_cpc_codes)}")
-    print(f"      • Unique CPC: {len(set(all_cpc_codes))}")
-    print(f"      • Citations processed: {len(citation_ids)}")
-    print(f"      • Metadata saved: {len(citation_metadata)}")
-    print(f"{'='*70}\n")
-    
-    return all_cpc_codes, citation_ids, citation_metadata
+_CPC_KEYWORDS: Dict[str, str] = _load_cpc_keyword_cache()
+_CPC_KEYWORDS_LOCK = threading.Lock()
+
+
+def _cpc_prefix(cpc_code: str) -> str:
+    """CPC 메인 그룹 prefix (H01L25/065 → H01L25)"""
+    return cpc_code.split("/")[0].strip().upper()
+
+
+def _lookup_cpc_keywords(cpc_code: str) -> Optional[str]:
+    return _CPC_KEYWORDS.get(cpc_code) or _CPC_KEYWORDS.get(_cpc_prefix(cpc_code))
+
+
+def _remember_cpc_keywords(mapping: Dict[str, str]) -> None:
+    """변환 결과를 코드/prefix 양쪽에 저장하고 JSON 파일 갱신 (json_write 원자적 교체)"""
+    if not mapping:
+        return
+    with _CPC_KEYWORDS_LOCK:
+        for code, keywords in mapping.items():
+            _CPC_KEYWORDS[code] = keywords
+            _CPC_KEYWORDS.setdefault(_cpc_prefix(code), keywords)
+        try:
+            os.makedirs(os.path.dirname(CPC_KEYWORD_CACHE_PATH), exist_ok=True)
+            json_write(CPC_KEYWORD_CACHE_PATH, _CPC_KEYWORDS, indent=True)
+        except (OSError, TypeError) as e:
+            logger.warning("   ⚠️ CPC keyword cache write failed: %s", e)
+
+
+def clear_cpc_cache() -> None:
+    """CPC 키워드 캐시 초기화 (메모리 + 파일)"""
+    with _CPC_KEYWORDS_LOCK:
+        _CPC_KEYWORDS.clear()
+        try:
+            os.remove(CPC_KEYWORD_CACHE_PATH)
+        except OSError:
+            pass
+
+
+def _fallback_cpc_keywords(cpc_code: str) -> str:
+    return _CPC_FALLBACK_KEYWORDS.get(_cpc_prefix(cpc_code)[:4], DEFAULT_CPC_KEYWORDS)
 
 
 def _convert_cpc_to_keywords(cpc_code: str) -> str:
+    """CPC → 키워드 변환 (캐시 우선, 미스 시 GPT 사용)"""
+    cached = _lookup_cpc_keywords(cpc_code)
+    if cached:
+        return cached
+
+    keywords = _convert_cpc_to_keywords_gpt(cpc_code)
+    if not keywords:
+        return _fallback_cpc_keywords(cpc_code)
+
+    _remember_cpc_keywords({cpc_code: keywords})
+    return keywords
+
+
+@lru_cache(maxsize=1)
+def _get_openai_client() -> "OpenAI":
+    """OpenAI 클라이언트 1회 생성 후 재사용 (HTTP 커넥션 풀 공유)"""
+    from openai import OpenAI
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+def _convert_cpc_to_keywords_gpt(cpc_code: str) -> Optional[str]:
     """CPC → 키워드 변환 (GPT 사용) - Fixed to avoid numbered lists"""
     if not _OPENAI_OK:
-        return "semiconductor device technology"
+        return None
     
     try:
-        import re
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        client = _get_openai_client()
         
         prompt = f"""CPC code: {cpc_code}
 
@@ -205,30 +314,100 @@ G06N3/045 → neural network training backpropagation
             temperature=0
         )
         
-        keywords = response.choices[0].message.content.strip()
-        
-        # Clean up arrows and CPC code
-        for sep in ["→", "->", cpc_code]:
-            keywords = keywords.replace(sep, "").strip()
-        
-        # ✅ Remove numbering if GPT still added it
-        keywords = re.sub(r"^\d+[\.\)]\s*", "", keywords)
-        
-        # ✅ If multi-line, take only first line
-        if "\n" in keywords:
-            keywords = keywords.split("\n")[0].strip()
-        
-        # ✅ Remove any numbering in the middle
-        keywords = re.sub(r"\s+\d+[\.\)]\s+", " ", keywords)
-        
-        # ✅ Final cleanup: remove extra spaces
-        keywords = " ".join(keywords.split())
-        
-        return keywords
+        return _clean_keywords(response.choices[0].message.content, cpc_code) or None
         
     except Exception as e:
-        print(f"   ⚠️ Keyword conversion failed: {e}")
-        return "semiconductor device technology"
+        logger.warning("   ⚠️ Keyword conversion failed: %s", e)
+        return None
+
+
+# GPT 키워드 출력 정리용 패턴 (모듈 로드 시 1회 컴파일)
+_KEYWORD_SEPS = ("→", "->")
+_NUM_PREFIX_RE = re.compile(r"^\d+[\.\)]\s*")
+_NUM_MID_RE = re.compile(r"\s+\d+[\.\)]\s+")
+
+
+def _clean_keywords(keywords: str, cpc_code: str) -> str:
+    """GPT 키워드 출력 정리 (화살표/CPC 코드/번호/줄바꿈 제거)"""
+    keywords = keywords.strip()
+
+    # Clean up arrows and CPC code
+    for sep in (*_KEYWORD_SEPS, cpc_code):
+        keywords = keywords.replace(sep, "").strip()
+    
+    # ✅ Remove numbering if GPT still added it
+    keywords = _NUM_PREFIX_RE.sub("", keywords)
+    
+    # ✅ If multi-line, take only first line
+    if "\n" in keywords:
+        keywords = keywords.split("\n")[0].strip()
+    
+    # ✅ Remove any numbering in the middle
+    keywords = _NUM_MID_RE.sub(" ", keywords)
+    
+    # ✅ Final cleanup: remove extra spaces
+    return " ".join(keywords.split())
+
+
+def _convert_cpc_codes_batch(cpc_codes: List[str]) -> Dict[str, str]:
+    """
+    여러 CPC → 키워드 일괄 변환 (GPT 1회 호출, JSON 응답)
+    
+    캐시(코드/prefix)에 있는 코드는 제외하고 나머지만 GPT에 요청
+
+    Returns:
+        {cpc_code: keywords} - 실패/누락된 코드는 포함되지 않음
+    """
+    keyword_map: Dict[str, str] = {}
+    missing: List[str] = []
+    for code in cpc_codes:
+        cached = _lookup_cpc_keywords(code)
+        if cached:
+            keyword_map[code] = cached
+        else:
+            missing.append(code)
+
+    if not _OPENAI_OK or not missing:
+        return keyword_map
+
+    try:
+        client = _get_openai_client()
+        codes_block = "\n".join(missing)
+
+        prompt = f"""CPC codes:
+{codes_block}
+
+For EACH CPC code, generate ONE single line of 2-4 space-separated technical keywords for patent search.
+DO NOT use numbering (1., 2., etc.). DO NOT use line breaks inside the keywords.
+Return a JSON object mapping every CPC code above to its keywords string.
+
+Example:
+{{"H01L25/065": "chip stacking TSV interposer", "G06F12/0802": "cache coherency protocol", "G06N3/045": "neural network training backpropagation"}}"""
+
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=50 * len(missing),
+            temperature=0,
+            response_format={"type": "json_object"},
+        )
+        data = json_loads(response.choices[0].message.content)
+
+        converted: Dict[str, str] = {}
+        for code in missing:
+            raw = data.get(code)
+            if isinstance(raw, str):
+                keywords = _clean_keywords(raw, code)
+                if keywords:
+                    converted[code] = keywords
+
+        _remember_cpc_keywords(converted)
+        keyword_map.update(converted)
+
+    except Exception as e:
+        logger.warning("   ⚠️ Batch keyword conversion failed: %s", e)
+
+    return keyword_map
 
 
 def _search_patents_with_keywords(
@@ -243,119 +422,183 @@ def _search_patents_with_keywords(
         # Example: "image recognition feature extraction" → "image recognition feature extraction patent"
         enhanced_query = f'{keyword} patent'
         
-        print(f"       Query: {enhanced_query}")
+        logger.info("       Query: %s", enhanced_query)
         
         params = {
-            "engine": "google_patents",
+            **SEARCH_BASE_PARAMS,
             "q": enhanced_query,
             "country": country,
             "num": max(10, num),  # ✅ Ensure minimum 10 (SerpAPI requirement)
-            "api_key": SERPAPI_KEY,
         }
         
-        r = requests.get(BASE_URL, params=params, timeout=30)
-        r.raise_for_status()
-        data = r.json()
-        
+        data = search_google_patents(params)
         if "error" in data:
-            print(f"       ❌ API Error: {data.get('error')}")
+            logger.warning("       ❌ API Error: %s", data.get('error'))
             return []
         
         results = data.get("organic_results", []) or []
         patent_ids = [item.get("patent_id") for item in results if item.get("patent_id")]
         
-        print(f"       ✅ Found {len(patent_ids)} patents")
+        logger.info("       ✅ Found %s patents", len(patent_ids))
         return patent_ids
         
     except Exception as e:
-        print(f"       ❌ Search failed: {e}")
+        logger.warning("       ❌ Search failed: %s", e)
         return []
 
 
 def _collect_cpc_from_patents(
     patent_ids: List[str]
-) -> tuple[List[str], List[Dict[str, Any]]]:
+) -> tuple[Counter, List[Dict[str, Any]]]:
     """
     확장 특허에서 CPC 수집 + 메타데이터 저장
     
     Returns:
-        (cpc_codes, patents_metadata)
+        (cpc_counter, patents_metadata)
     """
-    print(f"\n{'='*70}")
-    print(f"📋 Step 3: Collecting CPC from Expanded Patents")
-    print(f"{'='*70}")
-    print(f"   Total patents: {len(patent_ids)}\n")
+    logger.debug(_RULE)
+    logger.info("📋 Step 3: Collecting CPC from Expanded Patents")
+    logger.debug(_RULE)
+    logger.info("   Total patents: %s", len(patent_ids))
     
-    all_cpc_codes = []
-    patents_metadata = []  # ✅ 메타데이터 저장
+    # ✅ 확장 특허 상세 정보 동시 조회 + 도착 순 CPC/메타데이터 추출
+    cpc_counter, patents_metadata = _collect_cpc_and_metadata(patent_ids)
     
-    for i, pid in enumerate(patent_ids, start=1):
-        print(f"   [{i}/{len(patent_ids)}] {pid}")
-        
-        details = _fetch_patent_details(pid)
-        if not details:
-            continue
-        
-        # ✅ 메타데이터 저장
-        patents_metadata.append(_normalize_patent_metadata(details))
-        
-        # CPC 수집 (최대 개수 제한)
-        classifications = details.get("classifications", []) or []
-        cpc_count = 0
-        cpc_collected = 0
-        for cls in classifications:
-            if cls.get("is_cpc") and cls.get("code"):
-                cpc_count += 1
-                # ✅ 최대 개수 제한
-                if cpc_collected < MAX_CPC_PER_PATENT:
-                    all_cpc_codes.append(cls["code"])
-                    cpc_collected += 1
-        
-        if cpc_count > 0:
-            if cpc_count > MAX_CPC_PER_PATENT:
-                print(f"       ✅ {cpc_collected}/{cpc_count} CPC codes (limited)")
-            else:
-                print(f"       ✅ {cpc_count} CPC codes")
-        
-        time.sleep(0.3)
+    logger.debug(_RULE)
+    logger.info("   📊 Summary:")
+    logger.info("      • Successful: %s/%s", len(patents_metadata), len(patent_ids))
+    logger.info("      • Total CPC: %s", sum(cpc_counter.values()))
+    logger.info("      • Unique CPC: %s", len(cpc_counter))
+    logger.info("      • Metadata saved: %s", len(patents_metadata))
+    logger.debug(_RULE)
     
-    print(f"\n{'='*70}")
-    print(f"   📊 Summary:")
-    print(f"      • Successful: {len(patents_metadata)}/{len(patent_ids)}")
-    print(f"      • Total CPC: {len(all_cpc_codes)}")
-    print(f"      • Unique CPC: {len(set(all_cpc_codes))}")
-    print(f"      • Metadata saved: {len(patents_metadata)}")
-    print(f"{'='*70}\n")
-    
-    return all_cpc_codes, patents_metadata
+    return cpc_counter, patents_metadata
+
+
+def _norm_cpc(cpc_code: str) -> str:
+    """CPC 코드 → 독창성 계산 단위 (subclass: 대문자, '/' 이후 제거, 앞 4자리)"""
+    if CPC_SCORE_LEVEL == "subclass":
+        return cpc_code.upper().split("/")[0][:4]
+    return cpc_code
+
+
+def _score_counter(cpc_counter: Counter) -> Counter:
+    """CPC 빈도를 계산 단위로 합산 (서브그룹 노이즈로 다양성이 부풀려지는 것 방지)"""
+    if CPC_SCORE_LEVEL != "subclass":
+        return cpc_counter
+    scored: Counter = Counter()
+    for code, count in cpc_counter.items():
+        scored[_norm_cpc(code)] += count
+    return scored
 
 
-def _calc_originality_index(cpc_codes: List[str]) -> float:
-    """Herfindahl Index 기반 독창성 계산"""
-    if not cpc_codes:
+def _calc_originality_index(cpc_counter: Counter) -> float:
+    """Herfindahl Index 기반 독창성 계산 (CPC 빈도 Counter 1회 순회)"""
+    total = sum(cpc_counter.values())
+    if not total:
         return 0.0
     
-    counter = Counter(cpc_codes)
-    total = sum(counter.values())
-    hhi = sum((count / total) ** 2 for count in counter.values())
+    hhi = sum(count * count for count in cpc_counter.values()) / (total * total)
     
     return 1 - hhi
 
 
+def _patent_key(patent_id: str) -> str:
+    """중복 판정용 특허 키 (patent/US123A1/en, US123A1 → US123A1)"""
+    pid = patent_id.strip()
+    if pid.startswith("patent/"):
+        pid = pid[len("patent/"):]
+    return pid.split("/")[0].upper()
+
+
+def _expand_by_top_cpc(top_k: List[str], exclude_ids: List[str]) -> List[str]:
+    """
+    Top-K CPC → 키워드 검색으로 확장 특허 ID 수집
+    exclude_ids: 이미 조회된 특허 ID (대상/인용) → 확장 대상에서 제외 (ID 표기 차이 무시)
+    """
+    logger.debug(_RULE)
+    logger.info("📋 Step 2.5: Keyword Expansion")
+    logger.debug(_RULE)
+    
+    expanded_ids: List[str] = []
+    seen = {_patent_key(pid) for pid in exclude_ids if pid}
+
+    # ✅ Top-K CPC 키워드를 GPT 1회 호출로 일괄 변환
+    keyword_map = _convert_cpc_codes_batch(top_k)
+
+    # ✅ 일괄 변환 실패/누락 코드만 개별 변환 (GPT 호출 동시 실행)
+    leftover = [code for code in top_k if code not in keyword_map]
+    if leftover:
+        with ThreadPoolExecutor(max_workers=min(len(leftover), MAX_CONCURRENT_REQUESTS)) as ex:
+            keyword_map.update(zip(leftover, ex.map(_convert_cpc_to_keywords, leftover)))
+
+    # ✅ 같은 메인 그룹(prefix)이거나 키워드가 같은 CPC는 검색 1회로 통합
+    #    (동일 검색 결과는 이미 seen 처리되어 추가 0건 → 크레딧만 낭비)
+    search_codes: List[str] = []
+    keywords: List[str] = []
+    used_prefixes = set()
+    for code in top_k:
+        kw = keyword_map[code]
+        prefix = _cpc_prefix(code)
+        if prefix in used_prefixes or kw in keywords:
+            logger.info("   ⏭️ %s: same group/keywords as an earlier CPC, search skipped", code)
+            continue
+        used_prefixes.add(prefix)
+        search_codes.append(code)
+        keywords.append(kw)
+
+    # ✅ 키워드별 특허 검색 병렬 실행 (결과는 Top-K 순서대로 처리)
+    workers = max(1, min(len(keywords), MAX_CONCURRENT_REQUESTS))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        search_results = list(ex.map(
+            lambda kw: _search_patents_with_keywords(kw, num=PATENTS_PER_KEYWORD),
+            keywords,
+        ))
+    
+    for i, (code, kw, ids) in enumerate(zip(search_codes, keywords, search_results), 1):
+        # ⚠️ 최대 개수 도달 시 중단
+        if len(expanded_ids) >= MAX_EXPANDED_PATENTS:
+            logger.warning("   ⚠️ Reached max expanded patents (%s)", MAX_EXPANDED_PATENTS)
+            break
+        
+        logger.info("   [%s/%s] CPC: %s", i, len(search_codes), code)
+        logger.info("       Keywords: '%s'", kw)
+        logger.info("       Found: %s patents", len(ids))
+        
+        new_count = 0
+        for pid in ids:
+            key = _patent_key(pid)
+            if key in seen:
+                continue
+            seen.add(key)
+            expanded_ids.append(pid)
+            new_count += 1
+            if len(expanded_ids) >= MAX_EXPANDED_PATENTS:
+                break
+        
+        logger.info("       ➕ Added: %s", new_count)
+
+    logger.debug(_RULE)
+    logger.info("   📊 Total expanded: %s/%s", len(expanded_ids), MAX_EXPANDED_PATENTS)
+    logger.debug(_RULE)
+
+    return expanded_ids
+
+
 def patent_originality_node(state: OriginalityState) -> OriginalityState:
     """특허 독창성 분석 Agent (API 호출 최적화 + 메타데이터 저장)"""
     
-    print("\n" + "="*70)
-    print("🎯 Patent Originality Analysis Agent (Optimized)")
-    print("="*70)
-    print(f"⚡ API Call Limits:")
-    print(f"   • Max Citations: {MAX_CITATIONS}")
-    print(f"   • Top K CPC: {TOP_K_CPC}")
-    print(f"   • Patents per Keyword: {PATENTS_PER_KEYWORD}")
-    print(f"   • Max Expanded Patents: {MAX_EXPANDED_PATENTS}")
-    print("="*70)
+    logger.debug(_RULE)
+    logger.info("🎯 Patent Originality Analysis Agent (Optimized)")
+    logger.debug(_RULE)
+    logger.info("⚡ API Call Limits:")
+    logger.info("   • Max Citations: %s", MAX_CITATIONS)
+    logger.info("   • Top K CPC: %s", TOP_K_CPC)
+    logger.info("   • Patents per Keyword: %s", PATENTS_PER_KEYWORD)
+    logger.info("   • Max Expanded Patents: %s", MAX_EXPANDED_PATENTS)
+    logger.debug(_RULE)
     
-    if not SERPAPI_KEY:
+    if not HAS_SERPAPI_KEY:
         return {**state, "error": "SERPAPI_KEY not set"}
     
     if state.get("error"):
@@ -369,15 +612,15 @@ def patent_originality_node(state: OriginalityState) -> OriginalityState:
     if not target_id:
         return {**state, "error": "No target patent_id"}
 
-    print(f"🎯 Target: {target_id}\n")
+    logger.info("🎯 Target: %s", target_id)
 
     # Step 1: Citations CPC + metadata
-    base_cpc, citation_ids, citation_metadata = _collect_cpc_from_citations(
+    base_counter, citation_ids, citation_metadata = _collect_cpc_from_citations(
         target_id, 
         max_refs=MAX_CITATIONS
     )
 
-    if not base_cpc:
+    if not base_counter:
         return {
             **state,
             "target_patent_id": target_id,
@@ -395,74 +638,63 @@ def patent_originality_node(state: OriginalityState) -> OriginalityState:
         }
 
     # Step 2: Top-K CPC selection
-    print(f"{'='*70}")
-    print(f"📋 Step 2: Top-K CPC Selection")
-    print(f"{'='*70}")
+    logger.debug(_RULE)
+    logger.info("📋 Step 2: Top-K CPC Selection")
+    logger.debug(_RULE)
     
-    counter = Counter(base_cpc)
-    top_k = [c for c, _ in counter.most_common(TOP_K_CPC)]
+    top_k = [c for c, _ in base_counter.most_common(TOP_K_CPC)]
     
-    print(f"   🔝 Top {len(top_k)} CPC codes:")
+    logger.info("   🔝 Top %s CPC codes:", len(top_k))
     for i, code in enumerate(top_k, 1):
-        print(f"      {i}. {code} (count: {counter[code]})")
-    print()
-
-    # Step 3: Keyword expansion
-    print(f"{'='*70}")
-    print(f"📋 Step 2.5: Keyword Expansion")
-    print(f"{'='*70}")
-    
-    expanded_ids: List[str] = []
-    seen = {target_id, *citation_ids}
-    
-    for i, code in enumerate(top_k, 1):
-        # ⚠️ 최대 개수 도달 시 중단
-        if len(expanded_ids) >= MAX_EXPANDED_PATENTS:
-            print(f"\n   ⚠️ Reached max expanded patents ({MAX_EXPANDED_PATENTS})")
-            break
-        
-        print(f"\n   [{i}/{len(top_k)}] CPC: {code}")
-        kw = _convert_cpc_to_keywords(code)
-        print(f"       Keywords: '{kw}'")
-        
-        ids = _search_patents_with_keywords(kw, num=PATENTS_PER_KEYWORD)
-        print(f"       Found: {len(ids)} patents")
-        
-        new_count = 0
-        for pid in ids:
-            if len(expanded_ids) >= MAX_EXPANDED_PATENTS:
-                break
-            if pid not in seen and pid not in expanded_ids:
-                expanded_ids.append(pid)
-                seen.add(pid)
-                new_count += 1
-        
-        print(f"       ➕ Added: {new_count}")
-        time.sleep(0.3)
-
-    print(f"\n{'='*70}")
-    print(f"   📊 Total expanded: {len(expanded_ids)}/{MAX_EXPANDED_PATENTS}")
-    print(f"{'='*70}\n")
+        logger.info("      %s. %s (count: %s)", i, code, base_counter[code])
+
+    # Step 3: Keyword expansion (기본 CPC가 이미 충분히 다양하면 생략)
+    # ✅ 점수와 같은 단위(CPC_SCORE_LEVEL)로 다양성 판단
+    base_score_counter = _score_counter(base_counter)
+    prelim = _calc_originality_index(base_score_counter)
+    expansion_skipped = (
+        prelim >= EARLY_EXIT_ORIGINALITY
+        and len(base_score_counter) >= EARLY_EXIT_MIN_UNIQUE_CPC[CPC_SCORE_LEVEL]
+    )
+    if expansion_skipped:
+        logger.info("⏭️ Expansion skipped: base originality %.4f, %s unique scored CPC",
+                    prelim, len(base_score_counter))
+        expanded_ids: List[str] = []
+        expanded_counter: Counter = Counter()
+        expanded_metadata: List[Dict[str, Any]] = []
+    else:
+        # ✅ 대상/인용 특허는 이미 조회됨 → 확장 단계에서 재조회하지 않도록 제외
+        expanded_ids = _expand_by_top_cpc(top_k, [target_id, *citation_ids])
 
-    # Step 4: Expanded patents CPC + metadata
-    expanded_cpc, expanded_metadata = _collect_cpc_from_patents(expanded_ids)
+        # Step 4: Expanded patents CPC + metadata
+        expanded_counter, expanded_metadata = _collect_cpc_from_patents(expanded_ids)
 
     # Step 5: Calculate originality
-    print(f"{'='*70}")
-    print(f"📊 Step 4: Originality Calculation")
-    print(f"{'='*70}")
+    logger.debug(_RULE)
+    logger.info("📊 Step 4: Originality Calculation")
+    logger.debug(_RULE)
     
-    all_cpc = base_cpc + expanded_cpc
-    originality = _calc_originality_index(all_cpc)
-    dist = dict(Counter(all_cpc))
+    all_counter = base_counter + expanded_counter
+    score_counter = _score_counter(all_counter)
+    originality = _calc_originality_index(score_counter)
+    dist = dict(all_counter)  # 전체 CPC 코드 분포 (기존 출력 형식 유지)
+    base_total = sum(base_counter.values())
+    expanded_total = sum(expanded_counter.values())
+    all_total = base_total + expanded_total
+    all_unique = len(all_counter)  # Counter 키 수 = 고유 CPC 수 (set 재생성 불필요)
 
     stats: Dict[str, Any] = {
-        "base_cpc_count": len(base_cpc),
-        "expanded_cpc_count": len(expanded_cpc),
-        "total_cpc_count": len(all_cpc),
-        "unique_cpc_count": len(set(all_cpc)),
+        "base_cpc_count": base_total,
+        "expanded_cpc_count": expanded_total,
+        "total_cpc_count": all_total,
+        "unique_cpc_count": all_unique,
+        "base_unique_cpc_count": len(base_counter),
+        "expanded_unique_cpc_count": len(expanded_counter),
+        "cpc_level": CPC_SCORE_LEVEL,
+        "scored_unique_cpc_count": len(score_counter),
         "citations_analyzed": len(citation_ids),
         "patents_expanded": len(expanded_ids),
+        "expansion_skipped": expansion_skipped,
         "api_calls_saved": "~11 calls (vs original)",
     }
 
@@ -475,18 +707,18 @@ def patent_originality_node(state: OriginalityState) -> OriginalityState:
     else:
         interp = "⚠️ Low"
 
-    print(f"\n   🎯 Score: {originality:.4f} - {interp}")
-    print(f"\n   📊 Statistics:")
+    logger.info("   🎯 Score: %.4f - %s", originality, interp)
+    logger.info("   📊 Statistics:")
     for key, val in stats.items():
-        print(f"      • {key}: {val}")
+        logger.info("      • %s: %s", key, val)
     
-    if len(set(all_cpc)) >= 10:
-        print(f"\n   🔝 Top 10 CPC:")
-        for i, (code, count) in enumerate(Counter(all_cpc).most_common(10), 1):
-            pct = (count / len(all_cpc)) * 100
-            print(f"      {i:2d}. {code:15s} {count:3d} ({pct:5.1f}%)")
+    if all_unique >= 10:
+        logger.info("   🔝 Top 10 CPC:")
+        for i, (code, count) in enumerate(all_counter.most_common(10), 1):
+            pct = (count / all_total) * 100
+            logger.info("      %2d. %-15s %3d (%5.1f%%)", i, code, count, pct)
     
-    print(f"{'='*70}\n")
+    logger.debug(_RULE)
 
     out: OriginalityState = {**state}
     out.update({
@@ -498,40 +730,33 @@ def patent_originality_node(state: OriginalityState) -> OriginalityState:
 
     # ✅ 메타데이터 포함 JSON 저장
     try:
-        base_dir = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), 
-            "output", 
-            "originality"
-        )
-        os.makedirs(base_dir, exist_ok=True)
-        
         safe_id = ''.join(
             ch if (ch.isalnum() or ch in ('_','-')) else '_' 
             for ch in str(target_id)
         )
-        out_path = os.path.join(base_dir, f"{safe_id}_originality.json")
+        out_path = os.path.join(_output_dir(), f"{safe_id}_originality.json")
         
         output_data = {
             "target_patent_id": target_id,
             "originality_score": originality,
             "statistics": stats,
             "cpc_distribution": dist,
+            "scored_cpc_distribution": dict(score_counter),  # 점수 계산 단위(CPC_SCORE_LEVEL) 분포
             # ✅ 메타데이터 저장
             "citation_patents": citation_metadata,
             "expanded_patents": expanded_metadata,
         }
         
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
+        json_write(out_path, output_data, indent=True)
         
         out["originality_output_path"] = out_path
-        print(f"💾 Results saved: {out_path}")
-        print(f"   • Citations metadata: {len(citation_metadata)} patents")
-        print(f"   • Expanded metadata: {len(expanded_metadata)} patents")
+        logger.info("💾 Results saved: %s", out_path)
+        logger.info("   • Citations metadata: %s patents", len(citation_metadata))
+        logger.info("   • Expanded metadata: %s patents", len(expanded_metadata))
         
     except Exception as e:
         out["error"] = f"Save failed: {e}"
-        print(f"⚠️ Save failed: {e}")
+        logger.warning("⚠️ Save failed: %s", e)
 
     return out
 
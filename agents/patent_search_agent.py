@@ -1,11 +1,26 @@
 ﻿from __future__ import annotations
 
 import os
-import json
+import logging
 import requests
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, TypedDict
 from dotenv import load_dotenv
 
+from agents.patent_api import (
+    HAS_SERPAPI_KEY,
+    SEARCH_BASE_PARAMS,
+    clamp_num,
+    clamp_page,
+    fetch_many_details,
+    json_write,
+    normalize_item,
+    prepared_url,
+    safe_filename,
+    search_google_patents,
+)
+
 # Local state models (kept lightweight)
 try:
     from state.patent_state import PatentState  # type: ignore
@@ -32,64 +47,37 @@ except Exception:
         error: str
 
 
-load_dotenv()
-SERPAPI_KEY = os.getenv("SERPAPI_KEY")
-BASE_URL = "https://serpapi.com/search.json"
+if not os.getenv("SERPAPI_KEY"):
+    load_dotenv()
+
+logger = logging.getLogger(__name__)
 
 # ✅ Configuration
 TOP_N_PATENTS = 3  # Number of patents to enrich with full abstract
+SNIPPET_MIN_CHARS = 200  # 목록 응답 snippet이 이 길이 이상이면 상세 조회 생략 (HTTP 1회 절약)
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output", "patent_search")
 
 
-def _clamp_num(n: int) -> int:
-    return max(10, min(int(n), 100))
-
-
-def _clamp_page(p: int) -> int:
-    return max(1, int(p))
+@lru_cache(maxsize=1)
+def _output_dir() -> str:
+    """출력 폴더 생성은 프로세스당 1회"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    return OUTPUT_DIR
 
 
-def _prepared_url(params: Dict[str, Any], hide_key: bool = True) -> str:
-    from requests import Request
-    p = dict(params)
-    if hide_key:
-        p.pop("api_key", None)
-    return Request("GET", BASE_URL, params=p).prepare().url
-
-
-def _normalize_item(it: Dict[str, Any]) -> Dict[str, Any]:
-    return {
-        "title": it.get("title"),
-        "abstract": it.get("snippet"),
-        "patent_id": it.get("patent_id"),
-        "publication_number": it.get("publication_number"),
-        "publication_date": it.get("publication_date"),
-        "filing_date": it.get("filing_date"),
-        "priority_date": it.get("priority_date"),
-        "assignee": it.get("assignee"),
-        "inventor": it.get("inventor"),
-        "link": it.get("patent_link"),
-        "pdf": it.get("pdf"),
-    }
+def _abstract_full(det: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not det:
+        return None
+    return det.get("abstract") or det.get("description")
 
 
-def _fetch_details_abstract_full(patent_id: Optional[str]) -> Optional[str]:
-    if not SERPAPI_KEY or not patent_id:
-        return None
-    try:
-        r = requests.get(
-            BASE_URL,
-            params={
-                "engine": "google_patents_details",
-                "patent_id": patent_id,
-                "api_key": SERPAPI_KEY,
-            },
-            timeout=30,
-        )
-        r.raise_for_status()
-        det = r.json()
-        return det.get("abstract") or det.get("description")
-    except Exception:
-        return None
+def _enrich_count(state: PatentState, n_results: int) -> int:
+    """상세 조회 대상 수: enrich_all → 전체, enrich_first → 1건 (빠른 경로), 기본 → TOP_N_PATENTS"""
+    if state.get("enrich_all"):
+        return n_results
+    if state.get("enrich_first"):
+        return min(1, n_results)
+    return min(TOP_N_PATENTS, n_results)
 
 
 def _build_query(tech_name: str) -> str:
@@ -99,20 +87,17 @@ def _build_query(tech_name: str) -> str:
 
 def patent_search_node(state: PatentState) -> PatentState:
     """LangGraph node: search Google Patents and enrich TOP 3 items with full abstract."""
-    if not SERPAPI_KEY:
-        out = dict(state)
-        out["error"] = "SERPAPI_KEY not set"
-        return out  # type: ignore
+    if not HAS_SERPAPI_KEY:
+        return {**state, "error": "SERPAPI_KEY not set"}  # type: ignore
 
     tech_name = state.get("tech_name") or "HBM"
     query = _build_query(tech_name)
 
     params: Dict[str, Any] = {
-        "engine": "google_patents",
+        **SEARCH_BASE_PARAMS,
         "q": query,
-        "num": _clamp_num(state.get("num", 10)),
-        "page": _clamp_page(state.get("page", 1)),
-        "api_key": SERPAPI_KEY,
+        "num": clamp_num(state.get("num", 10)),
+        "page": clamp_page(state.get("page", 1)),
     }
     if state.get("country"):
         params["country"] = state["country"]
@@ -123,76 +108,80 @@ def patent_search_node(state: PatentState) -> PatentState:
     if state.get("ptype", "PATENT"):
         params["type"] = state.get("ptype", "PATENT")
 
-    safe_url = _prepared_url(params, hide_key=True)
+    safe_url = prepared_url(params, hide_key=True)
 
     try:
-        resp = requests.get(BASE_URL, params=params, timeout=30)
-        resp.raise_for_status()
+        data = search_google_patents(params)
     except requests.RequestException as e:
-        out = dict(state)
-        out.update({"error": f"SerpAPI request failed: {e}", "serpapi_url": safe_url, "query": query})
-        return out  # type: ignore
+        return {**state, "error": f"SerpAPI request failed: {e}", "serpapi_url": safe_url, "query": query}  # type: ignore
 
-    data = resp.json()
-    items_raw = data.get("organic_results", []) or []
-    rows: List[Dict[str, Any]] = [_normalize_item(it) for it in items_raw]
+    results = data.get("organic_results") or []
+    enrich_n = _enrich_count(state, len(results))
 
     # ✅ Enrich top N patents with full abstract
+    #    (details fetched concurrently, started before row normalization so the two overlap)
+    #    snippet이 충분히 긴 특허는 상세 조회 없이 snippet을 그대로 사용
+    fetch_ids = [
+        it.get("patent_id") for it in results[:enrich_n]
+        if len(it.get("snippet") or "") < SNIPPET_MIN_CHARS
+    ]
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        details_future = ex.submit(fetch_many_details, fetch_ids)
+        rows: List[Dict[str, Any]] = [normalize_item(it) for it in results]
+        top_rows = rows[:enrich_n]
+        logger.info("   🔍 Fetching full abstracts for %s/%s top patents...", len(fetch_ids), len(top_rows))
+        details_by_id = dict(zip(fetch_ids, details_future.result()))
+
     top_items: List[Dict[str, Any]] = []
-    for i, item in enumerate(rows[:TOP_N_PATENTS]):
+    for i, item in enumerate(top_rows):
         enriched_item = dict(item)
         patent_id = enriched_item.get("patent_id")
         
-        print(f"   🔍 [{i+1}/{min(TOP_N_PATENTS, len(rows))}] Fetching full abstract for: {patent_id}")
+        logger.info("   🔍 [%s/%s] %s", i + 1, len(top_rows), patent_id)
         
-        abstract_full = _fetch_details_abstract_full(patent_id)
+        snippet = enriched_item.get("abstract") or ""
+        if len(snippet) >= SNIPPET_MIN_CHARS:
+            abstract_full = snippet
+        else:
+            abstract_full = _abstract_full(details_by_id.get(patent_id))
         if abstract_full:
             enriched_item["abstract_full"] = abstract_full
-            print(f"       ✅ Full abstract retrieved ({len(abstract_full)} chars)")
+            logger.info("       ✅ Full abstract retrieved (%s chars)", len(abstract_full))
         else:
-            print(f"       ⚠️ Could not retrieve full abstract")
+            logger.warning("       ⚠️ Could not retrieve full abstract")
         
         top_items.append(enriched_item)
 
     # Legacy: keep first_item for backward compatibility
     first_item: Dict[str, Any] = top_items[0] if top_items else {}
 
-    out: PatentState = dict(state)
-    out.update(
-        {
-            "query": query,
-            "serpapi_url": safe_url,
-            "count": len(rows),
-            "items": rows,
-            "first_item": first_item,  # Legacy
-            "top_items": top_items,  # ✅ New: Top 3 patents with full abstract
-        }
-    )
+    out: PatentState = {
+        **state,
+        "query": query,
+        "serpapi_url": safe_url,
+        "count": len(rows),
+        "items": rows,
+        "first_item": first_item,  # Legacy
+        "top_items": top_items,  # ✅ New: Top 3 patents with full abstract
+    }
 
     # Persist JSON to /output/patent_search/
     try:
-        base_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output", "patent_search")
-        os.makedirs(base_dir, exist_ok=True)
-        out_path = os.path.join(base_dir, f"{tech_name}_result.json")
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "tech_name": tech_name,
-                    "query": out.get("query"),
-                    "serpapi_url": out.get("serpapi_url"),
-                    "count": out.get("count"),
-                    "items": out.get("items", []),
-                    "first_item": out.get("first_item", {}),  # Legacy
-                    "top_items": out.get("top_items", []),  # ✅ New
-                },
-                f,
-                ensure_ascii=False,
-                indent=2,
-            )
+        out_path = os.path.join(_output_dir(), f"{safe_filename(tech_name)}_result.json")
+        payload = {
+            "tech_name": tech_name,
+            "query": out.get("query"),
+            "serpapi_url": out.get("serpapi_url"),
+            "count": out.get("count"),
+            "items": out.get("items", []),
+            "first_item": out.get("first_item", {}),  # Legacy
+            "top_items": out.get("top_items", []),  # ✅ New
+        }
+        json_write(out_path, payload, indent=True)
         out["search_output_path"] = out_path  # type: ignore
-        print(f"\n💾 Search results saved: {out_path}")
-        print(f"   • Total results: {len(rows)}")
-        print(f"   • Top patents enriched: {len(top_items)}")
+        logger.info("💾 Search results saved: %s", out_path)
+        logger.info("   • Total results: %s", len(rows))
+        logger.info("   • Top patents enriched: %s", len(top_items))
     except Exception as e:
         out["error"] = f"Failed to write search JSON: {e}"  # type: ignore
 
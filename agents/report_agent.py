@@ -8,12 +8,17 @@ Report Agent (Country-Comparison Only)
 from __future__ import annotations
 
 import os
-import json
+import logging
 import platform
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
+from agents.patent_api import json_write
+
+logger = logging.getLogger(__name__)
+_RULE = "=" * 80  # 단계 구분선 (DEBUG 레벨에서만 출력)
+
 # ReportLab
 try:
     from reportlab.lib.pagesizes import A4
@@ -23,11 +28,62 @@ try:
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
     from reportlab.lib import colors
     from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.pdfbase.ttfonts import TTFont, TTFError
     _HAS_REPORTLAB = True
 except ImportError:
     _HAS_REPORTLAB = False
-    print("⚠️ ReportLab not available. Install: pip install reportlab")
+    logger.warning("⚠️ ReportLab not available. Install: pip install reportlab")
+
+# ========== 🔤 한글 폰트 후보 (경로, 폰트명, 볼드 여부) ==========
+_SYSTEM_FONT_CANDIDATES: Dict[str, List[Tuple[str, str, bool]]] = {
+    "Windows": [
+        ("C:/Windows/Fonts/malgun.ttf", "Malgun", False),
+        ("C:/Windows/Fonts/malgunbd.ttf", "MalgunBold", True),
+        ("C:/Windows/Fonts/NanumGothic.ttf", "NanumGothic", False),
+    ],
+    "Darwin": [
+        ("/System/Library/Fonts/AppleGothic.ttf", "AppleGothic", False),
+        ("/Library/Fonts/NanumGothic.ttf", "NanumGothic", False),
+    ],
+}
+_DEFAULT_FONT_CANDIDATES: List[Tuple[str, str, bool]] = [
+    ("/usr/share/fonts/truetype/nanum/NanumGothic.ttf", "NanumGothic", False),
+    ("/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf", "NanumGothicBold", True),
+    ("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf", "Liberation", False),
+]
+# 프로젝트 폰트 폴더 (agents/fonts → 프로젝트 루트/fonts 순, 없으면 실행 위치의 fonts/)
+_PROJECT_FONT_DIRS = (
+    str(Path(__file__).parent / "fonts"),
+    str(Path(__file__).parent.parent / "fonts"),
+)
+# 플랫폼 → (본문 폰트, 볼드 폰트): 폰트 탐색/TTF 파싱은 프로세스당 1회 (registerFont는 전역 등록)
+_FONT_CACHE: Dict[str, Tuple[str, str]] = {}
+# ===========================================
+
+# 국가비교 보고서 목차 (고정 구성, 특허 수와 무관 → 모듈 상수)
+_MULTI_COUNTRY_TOC = (
+    "1. SUMMARY",
+    "   1.1 Technology Competitiveness Overview",
+    "   1.2 Evaluation Results by Technology Keywords",
+    "   1.3 Strengths and Areas for Improvement",
+    "",
+    "2. DETAIL ANALYSIS",
+    "   2.1 Patent-by-Patent Analysis",
+    "   2.2 Technical Evaluation",
+    "   2.3 Market Evaluation",
+    "",
+    "3. COUNTRY COMPARISON",
+    "   3.1 Country-wise Statistics",
+    "   3.2 Country Details",
+    "",
+    "4. TECHNOLOGY GAP ANALYSIS",
+    "   4.1 Korea's Baseline Scores",
+    "   4.2 Technology Gap by Country",
+    "   4.3 Strategic Recommendations",
+    "",
+    "5. REFERENCE",
+    "6. APPENDIX",
+)
 
 
 class ReportAgent:
@@ -46,62 +102,68 @@ class ReportAgent:
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         self._register_fonts()
+        self._create_table_styles()
+        self._styles = self._create_styles()  # 스타일시트는 에이전트당 1회 생성 (보고서마다 재사용)
 
     # ------------------------ Font & Style ------------------------
     def _register_fonts(self):
-        """크로스플랫폼 한글 폰트 등록"""
+        """크로스플랫폼 한글 폰트 등록 (이미 등록된 프로세스에서는 캐시된 폰트명만 사용)"""
         system = platform.system()
+        cached = _FONT_CACHE.get(system)
+        if cached:
+            self.korean_font, self.korean_bold = cached
+            return
+
         font_registered = False
-        font_paths = []
-
-        if system == "Windows":
-            font_paths = [
-                ("C:/Windows/Fonts/malgun.ttf", "Malgun", False),
-                ("C:/Windows/Fonts/malgunbd.ttf", "MalgunBold", True),
-                ("C:/Windows/Fonts/NanumGothic.ttf", "NanumGothic", False),
-            ]
-        elif system == "Darwin":
-            font_paths = [
-                ("/System/Library/Fonts/AppleGothic.ttf", "AppleGothic", False),
-                ("/Library/Fonts/NanumGothic.ttf", "NanumGothic", False),
-            ]
-        else:
-            font_paths = [
-                ("/usr/share/fonts/truetype/nanum/NanumGothic.ttf", "NanumGothic", False),
-                ("/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf", "NanumGothicBold", True),
-                ("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf", "Liberation", False),
-            ]
-
-        possible_font_dirs = [
-            Path(__file__).parent / "fonts",
-            Path(__file__).parent.parent / "fonts",
-            Path.cwd() / "fonts",
-        ]
-        for project_fonts in possible_font_dirs:
-            if project_fonts.exists():
-                for font_file in project_fonts.glob("*.ttf"):
-                    font_name = font_file.stem
-                    is_bold = "Bold" in font_name or "bold" in font_name
-                    font_paths.append((str(font_file), font_name, is_bold))
-                break
+        font_paths = list(_SYSTEM_FONT_CANDIDATES.get(system, _DEFAULT_FONT_CANDIDATES))
 
+        # os.scandir: 항목별 Path 객체 생성 없이 이름만으로 .ttf 판별 (첫 번째로 존재하는 폴더만 사용)
+        for font_dir in (*_PROJECT_FONT_DIRS, os.path.join(os.getcwd(), "fonts")):
+            try:
+                with os.scandir(font_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".ttf") and entry.is_file():
+                            font_name = entry.name[:-4]
+                            is_bold = "Bold" in font_name or "bold" in font_name
+                            font_paths.append((entry.path, font_name, is_bold))
+            except OSError:
+                continue
+            break
+
+        # 존재 여부 stat 없이 바로 등록 시도 (없는 경로는 TTFError), 본문/볼드 확보 시 나머지 TTF 파싱 생략
         for font_path, font_name, is_bold in font_paths:
             try:
-                if os.path.exists(font_path):
-                    pdfmetrics.registerFont(TTFont(font_name, font_path))
-                    if not font_registered:
-                        self.korean_font = font_name
-                        font_registered = True
-                    if is_bold and not hasattr(self, "korean_bold"):
-                        self.korean_bold = font_name
-            except Exception:
+                pdfmetrics.registerFont(TTFont(font_name, font_path))
+            except (TTFError, OSError):
                 continue
+            if not font_registered:
+                self.korean_font = font_name
+                font_registered = True
+            if is_bold and not hasattr(self, "korean_bold"):
+                self.korean_bold = font_name
+            if hasattr(self, "korean_bold"):
+                break
 
         if not font_registered:
             self.korean_font = "Helvetica"
             self.korean_bold = "Helvetica-Bold"
         if not hasattr(self, "korean_bold"):
             self.korean_bold = self.korean_font
+        _FONT_CACHE[system] = (self.korean_font, self.korean_bold)
+
+    def _create_table_styles(self):
+        """특허별 상세 표 스타일 (특허마다 같은 명령을 다시 검증하지 않도록 1회 생성 후 공유)"""
+        def _scored_table_style(header_color: str) -> TableStyle:
+            return TableStyle([
+                ("FONT", (0, 0), (-1, -1), self.korean_font, 10),
+                ("FONT", (0, 0), (-1, 0), self.korean_bold, 11),
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor(header_color)),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                ("GRID", (0, 0), (-1, -1), 1, colors.HexColor("#bdc3c7")),
+            ])
+
+        self._tech_table_style = _scored_table_style("#2ecc71")
+        self._market_table_style = _scored_table_style("#3498db")
 
     def _create_styles(self):
         styles = getSampleStyleSheet()
@@ -184,17 +246,18 @@ class ReportAgent:
           - country_summaries: 국가별 평균/분포 요약
           - gap_analysis: 한국 기준 격차 분석 결과
         """
-        print("\n📊 Generating Multi-Country Comparison Report...")
+        logger.info("📊 Generating Multi-Country Comparison Report...")
 
-        # 보고서 데이터 구성
-        report_data = self._prepare_report_data_for_country(all_patents)
+        # 보고서 데이터 구성 (생성 시각은 1회만 조회 → 파일명/본문 날짜 일치)
+        now = datetime.now()
+        report_data = self._prepare_report_data_for_country(all_patents, now=now)
         report_data["country_summaries"] = country_summaries
         report_data["gap_analysis"] = gap_analysis
         report_data["is_multi_country"] = True
         report_data["title"] = f"한국의 {self.tech_name} 기술 경쟁력 보고서"
 
         # 파일 경로
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         filename_pdf = f"한국_{self.tech_name}_기술경쟁력보고서_{timestamp}.pdf"
         filename_json = f"한국_{self.tech_name}_기술경쟁력보고서_{timestamp}.json"
         pdf_path = self.output_dir / filename_pdf
@@ -202,11 +265,10 @@ class ReportAgent:
 
         # PDF 생성
         self._create_pdf_with_country_comparison(pdf_path, report_data)
-        print(f"✅ PDF Report: {pdf_path}")
+        logger.info("✅ PDF Report: %s", pdf_path)
 
-        # JSON 저장
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(report_data, f, ensure_ascii=False, indent=2)
+        # JSON 저장 (orjson 우선 + 원자적 교체, 없으면 큰 버퍼의 표준 json)
+        json_write(str(json_path), report_data, indent=True)
 
         return {
             "report_pdf_path": str(pdf_path),
@@ -220,18 +282,23 @@ class ReportAgent:
         }
 
     # ------------------------ Builder Methods ------------------------
-    def _prepare_report_data_for_country(self, all_patent_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _prepare_report_data_for_country(
+        self,
+        all_patent_results: List[Dict[str, Any]],
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
         """국가비교 보고서를 위한 공통 요약 생성"""
+        now = now or datetime.now()
         patents_summary = []
         total_originality, total_market = 0.0, 0.0
         grade_distribution = {"S": 0, "A": 0, "B": 0, "C": 0, "D": 0}
 
+        append = patents_summary.append
         for result in all_patent_results:
-            patent_id = result.get("target_patent_id") or result.get("patent_id", "N/A")
-            patent_title = (result.get("first_item") or {}).get("title") or result.get("title", "N/A")
-            originality = float(result.get("originality_score") or 0.0)
-            market = float(result.get("market_score") or 0.0)
-            grade = result.get("final_grade", "N/A")
+            get = result.get  # 특허당 1회 바인딩 → 필드 조회마다 속성 탐색 생략
+            originality = float(get("originality_score") or 0.0)
+            market = float(get("market_score") or 0.0)
+            grade = get("final_grade", "N/A")
 
             total_originality += originality
             total_market += market
@@ -239,18 +306,18 @@ class ReportAgent:
             if grade in grade_distribution:
                 grade_distribution[grade] += 1
 
-            patents_summary.append({
-                "patent_id": patent_id,
-                "title": patent_title,
+            append({
+                "patent_id": get("target_patent_id") or get("patent_id", "N/A"),
+                "title": (get("first_item") or {}).get("title") or get("title", "N/A"),
                 "originality_score": originality,
                 "market_score": market,
                 "final_grade": grade,
-                "market_size_score": float(result.get("market_size_score") or 0.0),
-                "growth_potential_score": float(result.get("growth_potential_score") or 0.0),
-                "commercialization_readiness": float(result.get("commercialization_readiness") or 0.0),
-                "application_domains": result.get("application_domains", []),
-                "llm_evaluation": result.get("llm_evaluation", {}),
-                "market_rationale": result.get("market_rationale", "")
+                "market_size_score": float(get("market_size_score") or 0.0),
+                "growth_potential_score": float(get("growth_potential_score") or 0.0),
+                "commercialization_readiness": float(get("commercialization_readiness") or 0.0),
+                "application_domains": get("application_domains", []),
+                "llm_evaluation": get("llm_evaluation", {}),
+                "market_rationale": get("market_rationale", "")
             })
 
         n = len(all_patent_results)
@@ -260,8 +327,8 @@ class ReportAgent:
         return {
             "title": f"{self.tech_name} Technology Competitiveness (Country Comparison)",
             "tech_name": self.tech_name,
-            "generated_at": datetime.now().isoformat(),
-            "generated_at_kr": datetime.now().strftime("%Y-%m-%d"),
+            "generated_at": now.isoformat(),
+            "generated_at_kr": now.strftime("%Y-%m-%d"),
             "total_patents_analyzed": n,
             "patents_summary": patents_summary,
             "statistics": {
@@ -279,9 +346,12 @@ class ReportAgent:
             rightMargin=72,
             leftMargin=72,
             topMargin=72,
-            bottomMargin=72
+            bottomMargin=72,
+            # 페이지 스트림 zlib 압축 명시 (rl_config 기본값에 의존 X), invariant → 난수 ID/타임스탬프 없이 재현 가능한 PDF
+            pageCompression=1,
+            invariant=1,
         )
-        styles = self._create_styles()
+        styles = self._styles
         story: List[Any] = []
 
         # 표지
@@ -344,30 +414,7 @@ class ReportAgent:
         content = []
         content.append(Paragraph("TABLE OF CONTENTS", styles["Heading1"]))
         content.append(Spacer(1, 0.3 * inch))
-        toc = [
-            "1. SUMMARY",
-            "   1.1 Technology Competitiveness Overview",
-            "   1.2 Evaluation Results by Technology Keywords",
-            "   1.3 Strengths and Areas for Improvement",
-            "",
-            "2. DETAIL ANALYSIS",
-            "   2.1 Patent-by-Patent Analysis",
-            "   2.2 Technical Evaluation",
-            "   2.3 Market Evaluation",
-            "",
-            "3. COUNTRY COMPARISON",
-            "   3.1 Country-wise Statistics",
-            "   3.2 Country Details",
-            "",
-            "4. TECHNOLOGY GAP ANALYSIS",
-            "   4.1 Korea's Baseline Scores",
-            "   4.2 Technology Gap by Country",
-            "   4.3 Strategic Recommendations",
-            "",
-            "5. REFERENCE",
-            "6. APPENDIX"
-        ]
-        for item in toc:
+        for item in _MULTI_COUNTRY_TOC:
             content.append(Paragraph(item, styles["Normal"]) if item else Spacer(1, 0.1 * inch))
         return content
 
@@ -414,12 +461,10 @@ class ReportAgent:
         content.append(Paragraph("1.3 Strengths and Areas for Improvement", styles["Heading2"]))
         strengths, weaknesses = self._analyze_strengths_weaknesses(stats, report_data)
         content.append(Paragraph("<b>Key Strengths:</b>", styles["Heading3"]))
-        for s in strengths:
-            content.append(Paragraph(f"• {s}", styles["Bullet"]))
+        content.append(self._bullet_list(strengths, styles))
         content.append(Spacer(1, 0.05 * inch))
         content.append(Paragraph("<b>Areas for Improvement:</b>", styles["Heading3"]))
-        for w in weaknesses:
-            content.append(Paragraph(f"• {w}", styles["Bullet"]))
+        content.append(self._bullet_list(weaknesses, styles))
 
         return content
 
@@ -449,75 +494,75 @@ class ReportAgent:
         for i, patent in enumerate(report_data["patents_summary"], 1):
             if i > 1:
                 content.append(PageBreak())
-            content.append(Paragraph(f"2.{i} Patent Analysis #{i}: {patent['patent_id']}", styles["Heading2"]))
-            content.append(Spacer(1, 0.1 * inch))
+            content.extend(self._generate_patent_detail(i, patent, styles))
 
-            title = patent["title"]
-            if len(title) > 100:
-                title = title[:100] + "..."
-            content.append(Paragraph(f"<b>Title:</b> {title}", styles["BodyText"]))
-            content.append(Spacer(1, 0.1 * inch))
+        return content
 
-            # Technical table
-            tech_data = [
-                ["Metric", "Score", "Grade/Level"],
-                ["Originality", f"{patent['originality_score']:.3f}", patent.get("final_grade", "N/A")],
-                ["Overall Tech", f"{patent['originality_score']:.3f}", self._get_score_level(patent['originality_score'])],
-            ]
-            tech_table = Table(tech_data, colWidths=[2 * inch, 1.5 * inch, 1.5 * inch])
-            tech_table.setStyle(TableStyle([
-                ("FONT", (0, 0), (-1, -1), self.korean_font, 10),
-                ("FONT", (0, 0), (-1, 0), self.korean_bold, 11),
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#2ecc71")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                ("GRID", (0, 0), (-1, -1), 1, colors.HexColor("#bdc3c7")),
-            ]))
-            content.append(tech_table)
-            content.append(Spacer(1, 0.15 * inch))
+    def _generate_patent_detail(self, i: int, patent: Dict[str, Any], styles) -> List[Any]:
+        """특허 1건의 상세 분석 flowable (다른 특허/보고서 상태와 독립)"""
+        content = []
+        content.append(Paragraph(f"2.{i} Patent Analysis #{i}: {patent['patent_id']}", styles["Heading2"]))
+        content.append(Spacer(1, 0.1 * inch))
 
-            # Market table
-            market_data = [
-                ["Metric", "Score", "Assessment"],
-                ["Market Size", f"{patent['market_size_score']:.2f}", self._get_score_level(patent['market_size_score'])],
-                ["Growth Potential", f"{patent['growth_potential_score']:.2f}", self._get_score_level(patent['growth_potential_score'])],
-                ["Commercialization Readiness", f"{patent['commercialization_readiness']:.2f}", self._get_score_level(patent['commercialization_readiness'])],
-                ["Overall Market", f"{patent.get('market_score', 0):.2f}", self._get_score_level(patent.get('market_score', 0))],
-            ]
-            market_table = Table(market_data, colWidths=[2.5 * inch, 1 * inch, 1.5 * inch])
-            market_table.setStyle(TableStyle([
-                ("FONT", (0, 0), (-1, -1), self.korean_font, 10),
-                ("FONT", (0, 0), (-1, 0), self.korean_bold, 11),
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#3498db")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                ("GRID", (0, 0), (-1, -1), 1, colors.HexColor("#bdc3c7")),
-            ]))
-            content.append(market_table)
-            content.append(Spacer(1, 0.15 * inch))
+        title = patent["title"]
+        if len(title) > 100:
+            title = title[:100] + "..."
+        content.append(Paragraph(f"<b>Title:</b> {title}", styles["BodyText"]))
+        content.append(Spacer(1, 0.1 * inch))
 
-            # Domains
-            domains = patent.get("application_domains", [])
-            if domains:
-                content.append(Paragraph("Application Domains", styles["Heading3"]))
-                for d in domains:
-                    content.append(Paragraph(f"• {d}", styles["Bullet"]))
-                content.append(Spacer(1, 0.1 * inch))
-
-            # Investment info (optional)
-            llm_eval = patent.get("llm_evaluation", {})
-            market_rationale = patent.get("market_rationale", "")
-            if llm_eval or market_rationale:
-                content.append(Paragraph("Investment Analysis", styles["Heading3"]))
-                if llm_eval:
-                    inv = llm_eval.get("investment_recommendation", "N/A")
-                    risk = llm_eval.get("risk_level", "N/A")
-                    content.append(Paragraph(f"• <b>Investment Recommendation:</b> {inv}", styles["Bullet"]))
-                    content.append(Paragraph(f"• <b>Risk Level:</b> {risk}", styles["Bullet"]))
-                if market_rationale:
-                    content.append(Paragraph("<b>Market Analysis:</b>", styles["BodyText"]))
-                    content.append(Paragraph(market_rationale, styles["BodyText"]))
+        # Technical table
+        tech_data = [
+            ["Metric", "Score", "Grade/Level"],
+            ["Originality", f"{patent['originality_score']:.3f}", patent.get("final_grade", "N/A")],
+            ["Overall Tech", f"{patent['originality_score']:.3f}", self._get_score_level(patent['originality_score'])],
+        ]
+        tech_table = Table(tech_data, colWidths=[2 * inch, 1.5 * inch, 1.5 * inch])
+        tech_table.setStyle(self._tech_table_style)
+        content.append(tech_table)
+        content.append(Spacer(1, 0.15 * inch))
+
+        # Market table
+        market_data = [
+            ["Metric", "Score", "Assessment"],
+            ["Market Size", f"{patent['market_size_score']:.2f}", self._get_score_level(patent['market_size_score'])],
+            ["Growth Potential", f"{patent['growth_potential_score']:.2f}", self._get_score_level(patent['growth_potential_score'])],
+            ["Commercialization Readiness", f"{patent['commercialization_readiness']:.2f}", self._get_score_level(patent['commercialization_readiness'])],
+            ["Overall Market", f"{patent.get('market_score', 0):.2f}", self._get_score_level(patent.get('market_score', 0))],
+        ]
+        market_table = Table(market_data, colWidths=[2.5 * inch, 1 * inch, 1.5 * inch])
+        market_table.setStyle(self._market_table_style)
+        content.append(market_table)
+        content.append(Spacer(1, 0.15 * inch))
+
+        # Domains
+        domains = patent.get("application_domains", [])
+        if domains:
+            content.append(Paragraph("Application Domains", styles["Heading3"]))
+            content.append(self._bullet_list(domains, styles))
+            content.append(Spacer(1, 0.1 * inch))
+
+        # Investment info (optional)
+        llm_eval = patent.get("llm_evaluation", {})
+        market_rationale = patent.get("market_rationale", "")
+        if llm_eval or market_rationale:
+            content.append(Paragraph("Investment Analysis", styles["Heading3"]))
+            if llm_eval:
+                inv = llm_eval.get("investment_recommendation", "N/A")
+                risk = llm_eval.get("risk_level", "N/A")
+                content.append(self._bullet_list([
+                    f"<b>Investment Recommendation:</b> {inv}",
+                    f"<b>Risk Level:</b> {risk}",
+                ], styles))
+            if market_rationale:
+                content.append(Paragraph("<b>Market Analysis:</b>", styles["BodyText"]))
+                content.append(Paragraph(market_rationale, styles["BodyText"]))
 
         return content
 
+    def _bullet_list(self, items: List[str], styles) -> Paragraph:
+        """글머리표 목록 → <br/>로 이은 Paragraph 1개 (항목마다 Paragraph 파싱/레이아웃 X)"""
+        return Paragraph("<br/>".join(f"• {item}" for item in items), styles["Bullet"])
+
     def _get_score_level(self, score: float) -> str:
         if score >= 0.8: return "Excellent"
         if score >= 0.6: return "Good"
@@ -697,12 +742,11 @@ class ReportAgent:
 
         # 5.2~5.4 기타 정보
         content.append(Paragraph(f"{section_no}.2 Data Sources and Methodology", styles["Heading2"]))
-        for s in [
+        content.append(self._bullet_list([
             "Patent databases: Google Patent",
             "Market analysis: Industry reports and market research",
             "Technology evaluation: Academic/technical documentation"
-        ]:
-            content.append(Paragraph(f"• {s}", styles["Bullet"]))
+        ], styles))
         content.append(Spacer(1, 0.2 * inch))
 
         content.append(Paragraph(f"{section_no}.3 Key References", styles["Heading2"]))
@@ -794,12 +838,12 @@ def pdf_report_agent_node_country(state: Dict[str, Any]) -> Dict[str, Any]:
       - gap_analysis: Dict                    # 한국 기준 격차 분석
       - output_dir: str (optional)
     """
-    print("\n" + "="*80)
-    print("📊 Step 5: PDF Report Generation (Country-Comparison Only)")
-    print("="*80)
+    logger.debug(_RULE)
+    logger.info("📊 Step 5: PDF Report Generation (Country-Comparison Only)")
+    logger.debug(_RULE)
 
     if state.get("error"):
-        print(f"⚠️ Skip: {state['error']}")
+        logger.warning("⚠️ Skip: %s", state["error"])
         return state
 
     tech_name = state.get("tech_name", "AI Chip")
@@ -823,7 +867,7 @@ def pdf_report_agent_node_country(state: Dict[str, Any]) -> Dict[str, Any]:
             all_patent_results, country_summaries, gap_analysis
         )
         state.update(result)
-        print(f"✅ PDF Report: {result['report_pdf_path']}")
+        logger.info("✅ PDF Report: %s", result["report_pdf_path"])
     except Exception as e:
         import traceback
         traceback.print_exc()
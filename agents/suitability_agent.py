@@ -6,18 +6,22 @@ Suitability Score Agent with LLM-as-a-Judge
 """
 
 from __future__ import annotations
-import os, json, re
+import os, json, re, time, hashlib, logging
+import importlib.util
 from typing import Any, Dict, Optional
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 
-try:
-    from openai import OpenAI
-    _OPENAI_OK = True
-except Exception:
-    _OPENAI_OK = False
-    print("⚠️ OpenAI not available. Install: pip install openai")
+logger = logging.getLogger(__name__)
+_RULE = "=" * 80  # 단계 구분선 (DEBUG 레벨에서만 출력)
+
+# OpenAI SDK는 무거워서 LLM Judge 사용 시에만 import (설치 여부만 미리 확인)
+_OPENAI_OK = importlib.util.find_spec("openai") is not None
+if not _OPENAI_OK:
+    logger.warning("⚠️ OpenAI not available. Install: pip install openai")
+
+from agents.patent_api import json_loads, json_write
 
 load_dotenv()
 
@@ -35,6 +39,13 @@ class ScoringConfig:
     }
 
 
+# ===== LLM Judge Cache =====
+# 같은 특허/점수로 재실행(보고서 재생성 등) 시 GPT 호출 생략, LLM_JUDGE_NO_CACHE=1 → 강제 재평가
+JUDGE_CACHE_TTL_SECONDS = 86400 * 7  # 7일
+JUDGE_USE_DISK_CACHE = os.getenv("LLM_JUDGE_NO_CACHE", "").lower() not in ("1", "true", "yes")
+JUDGE_CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "llm_judge"
+
+
 # ===== LLM Judge Prompts =====
 JUDGE_SYSTEM_PROMPT = """당신은 특허 기술의 지속가능성을 평가하는 전문가입니다.
 
@@ -125,6 +136,38 @@ Title: {patent_title}
     return prompt
 
 
+def _judge_cache_path(model: str, prompt: str) -> Path:
+    key = hashlib.blake2b(
+        f"{model}|{JUDGE_SYSTEM_PROMPT}|{prompt}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return JUDGE_CACHE_DIR / f"{key}.json"
+
+
+def _judge_cache_load(model: str, prompt: str) -> Optional[Dict[str, Any]]:
+    """LLM Judge 디스크 캐시 조회 (TTL 만료 시 None)"""
+    if not JUDGE_USE_DISK_CACHE:
+        return None
+    path = _judge_cache_path(model, prompt)
+    try:
+        if time.time() - path.stat().st_mtime > JUDGE_CACHE_TTL_SECONDS:
+            return None
+        return json_loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _judge_cache_store(model: str, prompt: str, evaluation: Dict[str, Any]) -> None:
+    """LLM Judge 디스크 캐시 저장 (실패해도 평가는 계속 진행)"""
+    if not JUDGE_USE_DISK_CACHE:
+        return
+    path = _judge_cache_path(model, prompt)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        json_write(str(path), evaluation)
+    except (OSError, TypeError) as e:
+        logger.warning("   ⚠️ LLM judge cache write failed: %s", e)
+
+
 # ===== Main Agent =====
 class SuitabilityScoreAgent:
     """
@@ -146,6 +189,7 @@ class SuitabilityScoreAgent:
         self.use_llm_judge = use_llm_judge and _OPENAI_OK
 
         if self.use_llm_judge:
+            from openai import OpenAI
             self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
             self.model = "gpt-4o-mini"  # or "gpt-4o"
 
@@ -164,11 +208,11 @@ class SuitabilityScoreAgent:
         """
         지속가능성 점수 계산 + LLM 평가 + 안전 저장
         """
-        print("=" * 80)
-        print(f"🌱 Suitability Score Calculation: {self.tech_name}")
+        logger.debug(_RULE)
+        logger.info("🌱 Suitability Score Calculation: %s", self.tech_name)
         if patent_id:
-            print(f"   Patent ID: {patent_id}")
-        print("=" * 80)
+            logger.info("   Patent ID: %s", patent_id)
+        logger.debug(_RULE)
 
         # 입력 검증
         if not (0 <= originality_score <= 1):
@@ -176,9 +220,9 @@ class SuitabilityScoreAgent:
         if not (0 <= market_score <= 1):
             raise ValueError(f"market_score must be in [0, 1], got {market_score}")
 
-        print("📊 Input Scores:")
-        print(f"   - Originality: {originality_score:.4f}")
-        print(f"   - Market: {market_score:.4f}")
+        logger.info("📊 Input Scores:")
+        logger.info("   - Originality: %.4f", originality_score)
+        logger.info("   - Market: %.4f", market_score)
 
         # ----- Step 1: 수식 기반 계산 -----
         if normalize_originality:
@@ -199,9 +243,9 @@ class SuitabilityScoreAgent:
             "calculated_grade": calculated_grade
         }
 
-        print("\n📐 Calculated Metrics:")
-        print(f"   - Score: {calculated_score:.4f}")
-        print(f"   - Grade: {calculated_grade}")
+        logger.info("📐 Calculated Metrics:")
+        logger.info("   - Score: %.4f", calculated_score)
+        logger.info("   - Grade: %s", calculated_grade)
 
         # ----- Step 2: LLM Judge 평가 -----
         llm_evaluation = None
@@ -209,7 +253,7 @@ class SuitabilityScoreAgent:
         final_score = calculated_score
 
         if self.use_llm_judge:
-            print("\n🤖 LLM Judge Evaluation...")
+            logger.info("🤖 LLM Judge Evaluation...")
 
             market_details = {
                 "market_size_score": market_size_score,
@@ -228,10 +272,10 @@ class SuitabilityScoreAgent:
 
             if llm_evaluation:
                 final_grade = llm_evaluation.get("suitability_grade", calculated_grade)
-                print(f"   ✅ LLM Grade: {final_grade}")
-                print(f"   ✅ Confidence: {llm_evaluation.get('confidence_score', 0):.2f}")
-                print(f"   ✅ Recommendation: {llm_evaluation.get('investment_recommendation', 'N/A')}")
-                print(f"   ✅ Risk Level: {llm_evaluation.get('risk_level', 'N/A')}")
+                logger.info("   ✅ LLM Grade: %s", final_grade)
+                logger.info("   ✅ Confidence: %.2f", llm_evaluation.get("confidence_score", 0))
+                logger.info("   ✅ Recommendation: %s", llm_evaluation.get("investment_recommendation", "N/A"))
+                logger.info("   ✅ Risk Level: %s", llm_evaluation.get("risk_level", "N/A"))
 
         # ----- Step 3: 종합 요약 생성 -----
         summary = self._generate_summary(
@@ -276,28 +320,28 @@ class SuitabilityScoreAgent:
         result["suitability_output_path"] = str(output_path)
 
         # 로그 출력
-        print("\n" + "=" * 80)
-        print("🎯 Final Evaluation Result")
-        print("=" * 80)
-        print(f"✅ Grade: {final_grade}")
-        print(f"   - Calculated: {calculated_grade} ({calculated_score:.4f})")
+        logger.debug(_RULE)
+        logger.info("🎯 Final Evaluation Result")
+        logger.debug(_RULE)
+        logger.info("✅ Grade: %s", final_grade)
+        logger.info("   - Calculated: %s (%.4f)", calculated_grade, calculated_score)
         if llm_evaluation:
-            print(f"   - LLM Assessed: {final_grade}")
-            print("\n💡 Key Strengths:")
+            logger.info("   - LLM Assessed: %s", final_grade)
+            logger.info("💡 Key Strengths:")
             for s in llm_evaluation.get("key_strengths", []):
-                print(f"   • {s}")
-            print("\n⚠️ Key Weaknesses:")
+                logger.info("   • %s", s)
+            logger.info("⚠️ Key Weaknesses:")
             for w in llm_evaluation.get("key_weaknesses", []):
-                print(f"   • {w}")
-            print(f"\n🎯 Investment: {llm_evaluation.get('investment_recommendation', 'N/A')}")
-            print(f"📊 Risk Level: {llm_evaluation.get('risk_level', 'N/A')}")
+                logger.info("   • %s", w)
+            logger.info("🎯 Investment: %s", llm_evaluation.get("investment_recommendation", "N/A"))
+            logger.info("📊 Risk Level: %s", llm_evaluation.get("risk_level", "N/A"))
             rationale = llm_evaluation.get("suitability_rationale", "")
             if rationale:
-                print("\n📝 Suitability Rationale:")
-                print(f"   {rationale}")
+                logger.info("📝 Suitability Rationale:")
+                logger.info("   %s", rationale)
 
-        print(f"\n💾 Saved to: {output_path}")
-        print("=" * 80)
+        logger.info("💾 Saved to: %s", output_path)
+        logger.debug(_RULE)
 
         return result
 
@@ -324,6 +368,9 @@ class SuitabilityScoreAgent:
                 calculated_grade,
                 market_details
             )
+            cached = _judge_cache_load(self.model, prompt)
+            if cached is not None:
+                return cached
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
@@ -334,9 +381,10 @@ class SuitabilityScoreAgent:
                 response_format={"type": "json_object"}
             )
             evaluation = json.loads(response.choices[0].message.content)
+            _judge_cache_store(self.model, prompt, evaluation)
             return evaluation
         except Exception as e:
-            print(f"   ⚠️ LLM evaluation failed: {e}")
+            logger.warning("   ⚠️ LLM evaluation failed: %s", e)
             return None
 
     # ---------- Scoring ----------
@@ -438,6 +486,9 @@ class SuitabilityScoreAgent:
 if __name__ == "__main__":
     import argparse
 
+    # 에이전트 로그(logging) 출력 설정 (LOG_LEVEL=DEBUG 시 단계 구분선까지 출력)
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(), format="%(message)s")
+
     parser = argparse.ArgumentParser(description="Suitability Agent with LLM Judge")
     parser.add_argument("tech_name", type=str, help="기술 키워드")
     parser.add_argument("--originality", type=float, required=True, help="독창성 점수")
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import os
 import json
+import logging
 from typing import Any, Dict, List
 from pathlib import Path
 from datetime import datetime
@@ -355,6 +356,8 @@ def analyze_technology_gap(country_results: List[Dict[str, Any]]) -> Dict[str, A
 # ===== Main =====
 def main():
     load_dotenv()
+    # 에이전트 로그(logging) 출력 설정 (LOG_LEVEL=DEBUG 시 단계 구분선까지 출력)
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(), format="%(message)s")
     
     tech_name = os.environ.get("TECH_NAME", "NPU")
     
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import os
 import re
+import pickle
 import unicodedata
 from pathlib import Path
 from typing import List, Tuple
@@ -25,6 +26,7 @@ except Exception:
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import PyPDFLoader
+from rank_bm25 import BM25Okapi
 
 # 환경변수 로드
 load_dotenv()
@@ -139,7 +141,34 @@ def dedupe_results(results: List[Tuple[Document, float]], max_items: int = 3) ->
 
 
 # -------------------------------------------------------------
-# 6) Chroma 인덱스 구축
+# 6) BM25 인덱스 사전 구축 (에이전트 시작 시 전체 코퍼스 재조회/토큰화 생략)
+# -------------------------------------------------------------
+# 포맷/토큰 패턴은 agents/market_size_growth_agent.py 의 BM25_INDEX_FORMAT / BM25_TOKEN_PATTERN 과 동일해야 함
+BM25_INDEX_FORMAT = "bm25okapi-v1"
+BM25_TOKEN_PATTERN = r"\w+"
+
+
+def build_bm25_index(split_docs: List[Document], chroma_dir: str | Path, collection_name: str) -> Path:
+    """청크 문서를 사전 토큰화해 BM25Okapi를 만들고 <chroma_dir>/<collection>_bm25.pkl 로 저장"""
+    bm25_path = Path(chroma_dir) / f"{collection_name}_bm25.pkl"
+    token_re = re.compile(BM25_TOKEN_PATTERN)
+    texts = [d.page_content for d in split_docs]
+    tokenized = [token_re.findall(t.lower()) for t in texts]
+    payload = {
+        "format": BM25_INDEX_FORMAT,
+        "token_pattern": BM25_TOKEN_PATTERN,
+        "bm25": BM25Okapi(tokenized) if tokenized else None,
+        "texts": texts,
+        "metadatas": [d.metadata for d in split_docs],
+    }
+    with open(bm25_path, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"  ✅ BM25 index saved: {bm25_path}")
+    return bm25_path
+
+
+# -------------------------------------------------------------
+# 7) Chroma 인덱스 구축
 # -------------------------------------------------------------
 def build_chroma_index(
     pdf_path: str = "data/품목별ICT시장동향_AI반도체.pdf",
@@ -201,6 +230,10 @@ def build_chroma_index(
         persist_directory=str(chroma_path),
     )
 
+    # BM25 인덱스도 함께 저장 (Chroma DB 이후 저장 → 에이전트가 최신 인덱스로 인식)
+    print(f"\n🔤 Building BM25 index...")
+    build_bm25_index(split_docs, chroma_path, collection_name)
+
     print(f"\n✅ Index build completed!")
     print(f"  Total chunks indexed: {len(split_docs)}")
     print(f"  Collection name: {collection_name}")
@@ -239,7 +272,7 @@ def build_chroma_index(
 
 
 # -------------------------------------------------------------
-# 7) CLI 실행
+# 8) CLI 실행
 # -------------------------------------------------------------
 if __name__ == "__main__":
     import argparse
@@ -1,11 +1,25 @@
 ﻿from __future__ import annotations
 
 import os
-import json
+import logging
 import requests
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, TypedDict
 from dotenv import load_dotenv
 
+from agents.patent_api import (
+    HAS_SERPAPI_KEY,
+    SEARCH_BASE_PARAMS,
+    clamp_num,
+    clamp_page,
+    fetch_patent_details,
+    json_write,
+    normalize_item,
+    prepared_url,
+    safe_filename,
+    search_google_patents,
+)
+
 # Local state models (kept lightweight)
 try:
     from state.patent_state import PatentState  # type: ignore
@@ -31,9 +45,20 @@ except Exception:
         error: str
 
 
-load_dotenv()
-SERPAPI_KEY = os.getenv("SERPAPI_KEY")
-BASE_URL = "https://serpapi.com/search.json"
+if not os.getenv("SERPAPI_KEY"):
+    load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SNIPPET_MIN_CHARS = 200  # snippet이 이 길이 이상이면 상세 조회 생략
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output", "patent_search")
+
+
+@lru_cache(maxsize=1)
+def _output_dir() -> str:
+    """출력 폴더 생성은 프로세스당 1회"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    return OUTPUT_DIR
 
 
 def _normalize_patent_id(patent_id: str) -> str:
@@ -55,40 +80,8 @@ def _normalize_patent_id(patent_id: str) -> str:
     return patent_id.strip()
 
 
-def _clamp_num(n: int) -> int:
-    return max(10, min(int(n), 100))
-
-
-def _clamp_page(p: int) -> int:
-    return max(1, int(p))
-
-
-def _prepared_url(params: Dict[str, Any], hide_key: bool = True) -> str:
-    from requests import Request
-    p = dict(params)
-    if hide_key:
-        p.pop("api_key", None)
-    return Request("GET", BASE_URL, params=p).prepare().url
-
-
-def _normalize_item(it: Dict[str, Any]) -> Dict[str, Any]:
-    return {
-        "title": it.get("title"),
-        "abstract": it.get("snippet"),
-        "patent_id": it.get("patent_id"),
-        "publication_number": it.get("publication_number"),
-        "publication_date": it.get("publication_date"),
-        "filing_date": it.get("filing_date"),
-        "priority_date": it.get("priority_date"),
-        "assignee": it.get("assignee"),
-        "inventor": it.get("inventor"),
-        "link": it.get("patent_link"),
-        "pdf": it.get("pdf"),
-    }
-
-
 def _fetch_details_abstract_full(patent_id: Optional[str]) -> Optional[str]:
-    if not SERPAPI_KEY or not patent_id:
+    if not HAS_SERPAPI_KEY or not patent_id:
         return None
     
     # Normalize patent ID
@@ -96,22 +89,11 @@ def _fetch_details_abstract_full(patent_id: Optional[str]) -> Optional[str]:
     if not normalized_id:
         return None
     
-    try:
-        r = requests.get(
-            BASE_URL,
-            params={
-                "engine": "google_patents_details",
-                "patent_id": normalized_id,
-                "api_key": SERPAPI_KEY,
-            },
-            timeout=30,
-        )
-        r.raise_for_status()
-        det = r.json()
-        return det.get("abstract") or det.get("description")
-    except Exception as e:
-        print(f"Warning: Failed to fetch full abstract for {normalized_id}: {e}")
+    det = fetch_patent_details(normalized_id)
+    if not det:
+        logger.warning("Warning: Failed to fetch full abstract for %s", normalized_id)
         return None
+    return det.get("abstract") or det.get("description")
 
 
 def _build_query(tech_name: str) -> str:
@@ -123,24 +105,23 @@ def patent_search_node(state: PatentState) -> PatentState:
     """LangGraph node: search Google Patents and enrich the first item."""
     
     # Check API key
-    if not SERPAPI_KEY:
+    if not HAS_SERPAPI_KEY:
         out = dict(state)
         out["error"] = "SERPAPI_KEY not set in environment variables"
-        print("❌ Error: SERPAPI_KEY not configured")
+        logger.warning("❌ Error: SERPAPI_KEY not configured")
         return out  # type: ignore
 
     tech_name = state.get("tech_name") or "HBM"
     query = _build_query(tech_name)
     
-    print(f"\n🔍 Searching Google Patents for: {tech_name}")
-    print(f"📝 Query: {query}")
+    logger.info("🔍 Searching Google Patents for: %s", tech_name)
+    logger.info("📝 Query: %s", query)
 
     params: Dict[str, Any] = {
-        "engine": "google_patents",
+        **SEARCH_BASE_PARAMS,
         "q": query,
-        "num": _clamp_num(state.get("num", 10)),
-        "page": _clamp_page(state.get("page", 1)),
-        "api_key": SERPAPI_KEY,
+        "num": clamp_num(state.get("num", 10)),
+        "page": clamp_page(state.get("page", 1)),
     }
     if state.get("country"):
         params["country"] = state["country"]
@@ -151,13 +132,12 @@ def patent_search_node(state: PatentState) -> PatentState:
     if state.get("ptype", "PATENT"):
         params["type"] = state.get("ptype", "PATENT")
 
-    safe_url = _prepared_url(params, hide_key=True)
+    safe_url = prepared_url(params, hide_key=True)
 
     # Make API request
     try:
-        print(f"🌐 Calling SerpAPI...")
-        resp = requests.get(BASE_URL, params=params, timeout=30)
-        resp.raise_for_status()
+        logger.info("🌐 Calling SerpAPI...")
+        data = search_google_patents(params)
     except requests.RequestException as e:
         out = dict(state)
         out.update({
@@ -165,12 +145,9 @@ def patent_search_node(state: PatentState) -> PatentState:
             "serpapi_url": safe_url,
             "query": query
         })
-        print(f"❌ Request failed: {e}")
+        logger.warning("❌ Request failed: %s", e)
         return out  # type: ignore
 
-    # Parse response
-    data = resp.json()
-    
     # Check for API errors
     if "error" in data:
         out = dict(state)
@@ -179,13 +156,13 @@ def patent_search_node(state: PatentState) -> PatentState:
             "serpapi_url": safe_url,
             "query": query
         })
-        print(f"❌ API Error: {data['error']}")
+        logger.warning("❌ API Error: %s", data["error"])
         return out  # type: ignore
     
-    items_raw = data.get("organic_results", []) or []
+    rows: List[Dict[str, Any]] = [normalize_item(it) for it in data.get("organic_results") or ()]
     
     # Check if no results found
-    if not items_raw:
+    if not rows:
         out = dict(state)
         out.update({
             "error": "No patents found for the given query. Try different search terms or broader criteria.",
@@ -195,25 +172,27 @@ def patent_search_node(state: PatentState) -> PatentState:
             "items": [],
             "first_item": {}
         })
-        print(f"⚠️ No patents found")
-        print(f"🔗 Search URL: {safe_url}")
+        logger.warning("⚠️ No patents found")
+        logger.info("🔗 Search URL: %s", safe_url)
         return out  # type: ignore
     
-    print(f"✅ Found {len(items_raw)} patents")
-    
-    rows: List[Dict[str, Any]] = [_normalize_item(it) for it in items_raw]
+    logger.info("✅ Found %s patents", len(rows))
 
     # Enrich first item with full abstract
     first_item: Dict[str, Any] = {}
     if rows:
         first_item = dict(rows[0])
-        print(f"📄 Fetching full abstract for: {first_item.get('patent_id')}")
-        abstract_full = _fetch_details_abstract_full(first_item.get("patent_id"))
+        logger.info("📄 Fetching full abstract for: %s", first_item.get("patent_id"))
+        snippet = first_item.get("abstract") or ""
+        if len(snippet) >= SNIPPET_MIN_CHARS:
+            abstract_full = snippet
+        else:
+            abstract_full = _fetch_details_abstract_full(first_item.get("patent_id"))
         if abstract_full:
             first_item["abstract_full"] = abstract_full
-            print(f"✅ Full abstract retrieved ({len(abstract_full)} chars)")
+            logger.info("✅ Full abstract retrieved (%s chars)", len(abstract_full))
         else:
-            print(f"⚠️ Could not retrieve full abstract, using snippet")
+            logger.warning("⚠️ Could not retrieve full abstract, using snippet")
 
     out: PatentState = dict(state)
     out.update(
@@ -228,28 +207,24 @@ def patent_search_node(state: PatentState) -> PatentState:
 
     # Persist JSON to /output/patent_search/
     try:
-        base_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output", "patent_search")
-        os.makedirs(base_dir, exist_ok=True)
-        out_path = os.path.join(base_dir, f"{tech_name}_result.json")
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "tech_name": tech_name,
-                    "query": out.get("query"),
-                    "serpapi_url": out.get("serpapi_url"),
-                    "count": out.get("count"),
-                    "items": out.get("items", []),
-                    "first_item": out.get("first_item", {}),
-                },
-                f,
-                ensure_ascii=False,
-                indent=2,
-            )
+        out_path = os.path.join(_output_dir(), f"{safe_filename(tech_name)}_result.json")
+        json_write(
+            out_path,
+            {
+                "tech_name": tech_name,
+                "query": out.get("query"),
+                "serpapi_url": out.get("serpapi_url"),
+                "count": out.get("count"),
+                "items": out.get("items", []),
+                "first_item": out.get("first_item", {}),
+            },
+            indent=True,
+        )
         out["search_output_path"] = out_path  # type: ignore
-        print(f"💾 Search results saved: {out_path}")
+        logger.info("💾 Search results saved: %s", out_path)
     except Exception as e:
         out["error"] = f"Failed to write search JSON: {e}"  # type: ignore
-        print(f"⚠️ Failed to save results: {e}")
+        logger.warning("⚠️ Failed to save results: %s", e)
 
     return out
 